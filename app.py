@@ -8,16 +8,27 @@
 #      → Under-construction projects; we temporarily assign them to checkpoints/milestones
 # ──────────────────────────────────────────────────────────────────────────────
 
-import re
 import base64
-import random
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 import pandas as pd
 import streamlit as st
 import streamlit.components.v1 as components
-import plotly.express as px
+
+from src.aggregates import kpi_summary
+from src.developers import resolve_developers_registered
+from src.geo import GEOJSON_PATH, MAP_COMPONENT_DIR, SIMPLIFIED_FORMAT, ensure_simplified_geometry
+from src.loaders import (DEVELOPER_IDS_FILE, EVENTS_DIR, MILES_FILE, REPORTS_DIR, assign_process,
+                         assigned_version, events_version, find_previous_uc_file, find_uc_file,
+                         milestone_structure, norm_key, read_milestone_state, read_milestones,
+                         read_uc_clean)
+from src.report_diff import diff_reports
+from src.risk import NO_PROGRESS, RISK_GROUPS, aggregate_risk, compute_schedule_risk
+from src.rollups import DATE_BASES, GRANULARITIES, build_time_rollups, query_rollup
+from src.search_index import build_search_index
+from src.table_pages import build_sort_index, page_count, page_slice
+from src.utils.versioning import dataset_version
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Page Config & Global Styles
@@ -166,6 +177,7 @@ for k, v in {
     "selected_state": None,
     "selected_checkpoint": None,
     "selected_milestone": None,
+    "search_query": "",
     "_pv_logged": False,  # used by private logger
 }.items():
     if k not in st.session_state:
@@ -227,79 +239,32 @@ def img_tag(path: str, height_px: int = 65, alt: str = "") -> str:
     except Exception:
         return ""
 
-MNRE_LOGO = find_logo(["MNRE.png", "mnre.png", "MNRE.PNG"])
-NSEFI_LOGO = find_logo(["12th_year_anniversary_logo_transparent.png",
-                        "12th_year_anniversary_logo_transparent.PNG"])
+@st.cache_data(show_spinner=False)
+def logo_tag(possible_names: tuple, height_px: int = 65, alt: str = "") -> str:
+    # directory scan + base64 encoding once per process instead of on every rerun
+    path = find_logo(list(possible_names))
+    return img_tag(path, height_px=height_px, alt=alt) if path else ""
+
+MNRE_LOGO = logo_tag(("MNRE.png", "mnre.png", "MNRE.PNG"), height_px=65, alt="MNRE")
+NSEFI_LOGO = logo_tag(("12th_year_anniversary_logo_transparent.png",
+                       "12th_year_anniversary_logo_transparent.PNG"), height_px=65, alt="NSEFI")
 
 col1, col2, col3 = st.columns([1, 4, 1])
 with col1:
     if MNRE_LOGO:
-        st.markdown(img_tag(MNRE_LOGO, height_px=65, alt="MNRE"), unsafe_allow_html=True)
+        st.markdown(MNRE_LOGO, unsafe_allow_html=True)
 with col2:
     st.markdown("<h1 class='main-title'>Real Time Project Milestone Monitoring Dashboard</h1>", unsafe_allow_html=True)
 with col3:
     if NSEFI_LOGO:
-        st.markdown(img_tag(NSEFI_LOGO, height_px=65, alt="NSEFI"), unsafe_allow_html=True)
-
-# ──────────────────────────────────────────────────────────────────────────────
-# Helpers
-# ──────────────────────────────────────────────────────────────────────────────
-def pickcol(cols, *candidates):
-    cols = [str(c) for c in cols]
-    low = {c.lower().strip(): c for c in cols}
-    for cand in candidates:
-        k = str(cand).lower().strip()
-        if k in low:
-            return low[k]
-    for cand in candidates:
-        k = str(cand).lower().strip()
-        for c in cols:
-            if k in c.lower():
-                return c
-    return None
-
-def norm_text_series(s: pd.Series) -> pd.Series:
-    s = s.astype(str).str.strip()
-    s = s.replace({"nan": pd.NA, "None": pd.NA})
-    s = s.str.replace(r"\s+", " ", regex=True)
-    return s
-
-def norm_key(s: str) -> str:
-    if s is None or (isinstance(s, float) and pd.isna(s)):
-        return ""
-    s = str(s).lower().strip().replace("&","and")
-    s = re.sub(r"[^a-z ]", "", s)
-    s = re.sub(r"\s+", " ", s)
-    return s
-
-def parse_mw(val):
-    if pd.isna(val):
-        return pd.NA
-    if isinstance(val, (int, float)):
-        return float(val)
-    s = str(val)
-    s = re.sub(r"[^\d.]", "", s.replace(",", ""))
-    try:
-        return float(s) if s else pd.NA
-    except Exception:
-        return pd.NA
+        st.markdown(NSEFI_LOGO, unsafe_allow_html=True)
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Milestones (Sheet1)
 # ──────────────────────────────────────────────────────────────────────────────
-MILES_FILE = "Milestones in RE projects.xlsx"
-
 @st.cache_data
 def load_milestones(file_path: str):
-    df = pd.read_excel(file_path, sheet_name="Sheet1")
-    df = df.rename(columns={"Step No": "Step_No", "Checkpoints": "Checkpoint", "Milestones": "Milestone"})
-    df = df.dropna(how="all")
-    for c in ["Checkpoint", "Milestone"]:
-        df[c] = df[c].astype(str).str.strip()
-    df["Checkpoint"] = df["Checkpoint"].replace({"nan": pd.NA}).ffill()
-    if "Step_No" in df.columns:
-        df = df.sort_values("Step_No")
-    return df.reset_index(drop=True)
+    return read_milestones(file_path)
 
 if Path(MILES_FILE).exists():
     milestones_df = load_milestones(MILES_FILE)
@@ -307,104 +272,43 @@ else:
     milestones_df = pd.DataFrame()
     st.error("⚠️ Add 'Milestones in RE projects.xlsx' in the project root.")
 
-if not milestones_df.empty:
-    cp_order_df = (milestones_df[["Step_No","Checkpoint"]]
-                   .dropna(subset=["Checkpoint"])
-                   .drop_duplicates(subset=["Checkpoint"], keep="first"))
-    CHECKPOINT_ORDER = (cp_order_df.sort_values("Step_No")["Checkpoint"].tolist()
-                        if "Step_No" in cp_order_df.columns else cp_order_df["Checkpoint"].tolist())
-    # Clean milestone lists
-    CP_TO_MS = {}
-    for cp in CHECKPOINT_ORDER:
-        ms = milestones_df.loc[milestones_df["Checkpoint"] == cp, "Milestone"].astype(str).str.strip().tolist()
-        ms = [m for m in ms if m and m.lower() != "nan"]
-        CP_TO_MS[cp] = ms
-else:
-    CHECKPOINT_ORDER, CP_TO_MS = [], {}
+CHECKPOINT_ORDER, CP_TO_MS, MS_TO_CP = milestone_structure(milestones_df)
+
+# First paint: the workflow bar is drawn as a static skeleton from the (small)
+# milestones sheet before the project workbook is parsed; PAGE swaps the real
+# search box / buttons into these slots once the data is ready.
+search_slot = st.empty()
+workflow_slot = st.empty()
+if CHECKPOINT_ORDER:
+    workflow_slot.markdown(
+        "<h2 class='subheader'>Project Process Workflow</h2>"
+        "<div style='display:flex;gap:12px;'>"
+        + "".join(f"<div class='card' style='flex:1;font-weight:700;'>{i}. {cp}"
+                  f"<div class='kpi-label'>loading projects…</div></div>"
+                  for i, cp in enumerate(CHECKPOINT_ORDER, start=1))
+        + "</div>",
+        unsafe_allow_html=True,
+    )
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Under-construction Excel — ONLY Sheet 3
 # ──────────────────────────────────────────────────────────────────────────────
-UC_FILE_CANDIDATES = [
-    "Quarterly_Report_on_Under_Construction_Renewable_Energy_Projects_as_on_June_2025.xlsx",
-    "Quarterly_Report_on_Under_Construction_Renewable_Energy_Projects_as_on_June_2025..xlsx",
-]
-
-def find_uc_file():
-    for cand in UC_FILE_CANDIDATES:
-        if Path(cand).exists():
-            return cand
-    return None
-
-def read_uc_ucprojects_sheet(path: str):
-    xl = pd.ExcelFile(path)
-    wanted = None
-    for nm in xl.sheet_names:
-      if str(nm).strip().lower() == "under construction projects":
-        wanted = nm
-        break
-    if wanted is None:
-        raise ValueError("The workbook does not contain a sheet named 'Under Construction Projects'.")
-    df = xl.parse(wanted)
-    df.rename(columns=lambda x: str(x).strip().replace("\\n"," ").replace("  "," "), inplace=True)
-    return df
-
-def normalize_project_type(v: str) -> str:
-    t = norm_key(v)
-    if any(k in t for k in ["hybrid","mix"]): return "Hybrid"
-    if any(k in t for k in ["wind"]):   return "Wind"
-    if any(k in t for k in ["solar","pv"]): return "Solar"
-    if any(k in t for k in ["hydro","hydel","psp","pumped"]): return "Hydro/PSP"
-    if any(k in t for k in ["battery","storage","bess"]): return "Storage"
-    return "Other"
-
-CPSU_TOKENS = [
-    "ntpc","nhpc","seci","nlc","sgel","sjvn","gail","iocl","ongc","bhel",
-    "pfc","rec","railway","indian oil","powergrid","pgcil","sail","coal india","cil"
-]
-
-def classify_owner(developer: str) -> str:
-    s = norm_key(developer)
-    return "CPSU" if any(tok in s for tok in CPSU_TOKENS) else "Private"
+@st.cache_data(show_spinner=False)
+def developer_alias_map(version: str, _developers: pd.Series) -> pd.DataFrame:
+    # alias → Developer_Canonical / Developer_ID, computed once per dataset version;
+    # ids of known spellings come from (and new ones go to) the developer id registry
+    return resolve_developers_registered(_developers, DEVELOPER_IDS_FILE)
 
 @st.cache_data
-def load_uc_clean(path: str):
-    raw = read_uc_ucprojects_sheet(path)
-
-    cols = [str(c) for c in raw.columns]
-    c_serial  = pickcol(cols, "S. No", "S No", "Sr. No", "Sl No", "Serial", "Sl. No.")
-    c_project = pickcol(cols, "Project Name","Project","Name")
-    c_state   = pickcol(cols, "State", "State/UT", "Location State")
-    c_dev     = pickcol(cols, "Developer","Implementing Agency","Agency","Owner","Developer Name")
-    c_type    = pickcol(cols, "Project Type","Type","Technology","Mode")
-    c_cap     = pickcol(cols, "Capacity (MW)","Capacity MW","Capacity in MW","Capacity")
-    c_cod     = pickcol(cols, "COD","Expected COD","Date of Commissioning","Start Date","Date")
-
-    df = pd.DataFrame()
-    df["Serial"]       = pd.to_numeric(raw[c_serial], errors="coerce") if c_serial else pd.NA
-    df["Project_Name"] = norm_text_series(raw[c_project]) if c_project else pd.NA
-    df["State"]        = norm_text_series(raw[c_state])   if c_state   else pd.NA
-    df["Developer"]    = norm_text_series(raw[c_dev])     if c_dev     else pd.NA
-    df["Project_Type"] = norm_text_series(raw[c_type])    if c_type    else pd.NA
-    df["Capacity_MW"]  = raw[c_cap].apply(parse_mw) if c_cap else pd.NA
-    df["Date"]         = pd.to_datetime(raw[c_cod], errors="coerce") if c_cod else pd.NaT
-
-    mask_total = (df["Project_Name"].str.contains("total", case=False, na=False)) | \
-                 (df["State"].str.contains("total", case=False, na=False))
-    df = df[~mask_total]
-    df = df.dropna(how="all", subset=["Project_Name","State","Capacity_MW"])
-
-    df["Project_Type"] = df["Project_Type"].fillna("").apply(normalize_project_type)
-    df["Owner_Class"]  = df["Developer"].fillna("").apply(classify_owner)
-    df["Developer_norm"] = (df["Developer"].fillna("")
-                            .str.lower().str.strip().str.replace(r"\s+"," ", regex=True))
-    df["Project_Row"] = 1
-    return df.reset_index(drop=True)
+def load_uc_clean(path: str, version: str | None = None):
+    # `version` only keys the cache: a replaced workbook gets re-parsed.
+    return read_uc_clean(path, alias_map=lambda devs: developer_alias_map(version or path, devs))
 
 UC_FILE = find_uc_file()
+UC_VERSION = dataset_version(UC_FILE)
 if UC_FILE:
     try:
-        uc_df = load_uc_clean(UC_FILE)
+        uc_df = load_uc_clean(UC_FILE, UC_VERSION)
     except Exception as e:
         uc_df = pd.DataFrame()
         st.error(f"Could not load Under-Construction data: {e}")
@@ -413,35 +317,32 @@ else:
     st.info("Add the Quarterly Under-Construction Excel (we only read Sheet 3: 'Under Construction Projects').")
 
 # ──────────────────────────────────────────────────────────────────────────────
-# Randomly assign checkpoints/milestones (temporary)
+# Checkpoints/milestones — from the milestone event log; random placeholder
+# assignment only while no events have been dropped yet
 # ──────────────────────────────────────────────────────────────────────────────
-def assign_random_process(df_uc: pd.DataFrame, checkpoints: list[str], cp_to_ms: dict):
-    if df_uc.empty or not checkpoints:
-        return df_uc
-    rng = random.Random(42)
-    ms_choices = {cp: ([m for m in ms if str(m).strip()] or ["General"]) for cp, ms in cp_to_ms.items()}
-    for cp in checkpoints:
-        ms_choices.setdefault(cp, ["General"])
-    start_window = datetime.now() - timedelta(days=730)
-    span = max(1, (datetime.now() - start_window).days)
+@st.cache_data(show_spinner=False)
+def load_milestone_state(version: str) -> pd.DataFrame:
+    # `version` fingerprints the drop files, so new drops trigger an incremental sync
+    return read_milestone_state(MS_TO_CP)
 
-    cps, mss, dates = [], [], []
-    for _ in range(len(df_uc)):
-        cp = rng.choice(checkpoints)
-        ms = rng.choice(ms_choices[cp])
-        d  = start_window + timedelta(days=rng.randint(0, span))
-        cps.append(cp); mss.append(ms); dates.append(d.date())
+EVENTS_VERSION = events_version()
+milestone_state = load_milestone_state(EVENTS_VERSION)
+PROCESS_FROM_EVENTS = not milestone_state.empty
 
-    out = df_uc.copy()
-    out["Checkpoint"] = pd.Series(cps).fillna("Unassigned")
-    out["Milestone"]  = pd.Series(mss).fillna("Unassigned")
-    out["Milestone_Start_Date"] = dates
-    return out
+assigned_df = assign_process(uc_df, milestone_state, CHECKPOINT_ORDER, CP_TO_MS)
+ASSIGNED_VERSION = assigned_version(MILES_FILE, UC_FILE, EVENTS_VERSION, PROCESS_FROM_EVENTS)
 
-assigned_df = assign_random_process(uc_df, CHECKPOINT_ORDER, CP_TO_MS)
-if not assigned_df.empty:
-    assigned_df["Checkpoint"] = assigned_df["Checkpoint"].astype(str).replace({"nan":"Unassigned"}).fillna("Unassigned")
-    assigned_df["Milestone"]  = assigned_df["Milestone"].astype(str).replace({"nan":"Unassigned"}).fillna("Unassigned")
+# ──────────────────────────────────────────────────────────────────────────────
+# Search index (Project_Name / Developer / State) — built once per dataset version
+# ──────────────────────────────────────────────────────────────────────────────
+SEARCH_LIMIT = 50
+
+@st.cache_resource(show_spinner=False)
+def get_search_index(version: str, _df: pd.DataFrame):
+    # Row positions in the index line up with uc_df / assigned_df (both RangeIndex).
+    return build_search_index(_df)
+
+SEARCH_INDEX = get_search_index(UC_VERSION, uc_df) if not uc_df.empty else None
 
 # ──────────────────────────────────────────────────────────────────────────────
 # UI: Checkpoints & Milestones
@@ -451,6 +352,9 @@ def render_checkpoints_row():
     if not CHECKPOINT_ORDER:
         st.info("Milestones file not found/empty.")
         return
+    if not PROCESS_FROM_EVENTS:
+        st.caption(f"Placeholder assignment — drop milestone event files into `{EVENTS_DIR}/drops/` "
+                   "(Project ID, Checkpoint, Milestone, Timestamp) to show real progress.")
     cols = st.columns(len(CHECKPOINT_ORDER))
     for i, cp in enumerate(CHECKPOINT_ORDER, start=1):
         count = int(assigned_df[assigned_df["Checkpoint"] == cp].shape[0]) if not assigned_df.empty else 0
@@ -484,36 +388,247 @@ def render_milestones_grid(cp: str, cols_per_row: int = 4):
                     st.session_state.selected_milestone = (None if st.session_state.get("selected_milestone") == m else m)
             j += 1
 
+def _search_label(row: int) -> str:
+    rec = assigned_df.iloc[row]
+    parts = [str(rec["Project_Name"]) if pd.notna(rec.get("Project_Name")) else "—"]
+    if pd.notna(rec.get("Developer")):
+        parts.append(str(rec["Developer"]))
+    if pd.notna(rec.get("State_Name")):
+        parts.append(str(rec["State_Name"]))
+    return " · ".join(parts)
+
+def _open_search_pick():
+    row = st.session_state.get("search_pick")
+    if row is None:
+        return
+    rec = assigned_df.iloc[int(row)]
+    st.session_state.selected_checkpoint = rec["Checkpoint"]
+    st.session_state.selected_milestone = rec["Milestone"]
+
+def render_search():
+    """Search box + results; returns all matching row positions, or None when idle."""
+    # st.text_input only reruns on Enter / focus loss, so this is search-on-submit, not typeahead
+    q = st.text_input("Search projects, developers or states (press Enter)", key="search_query",
+                      placeholder="e.g. NTPC, Bhadla, Rajasthan — then press Enter").strip()
+    if len(q) < 2 or SEARCH_INDEX is None:
+        return None
+    hits = SEARCH_INDEX.search(q, limit=None)
+    if not len(hits):
+        st.info(f"No projects match “{q}”.")
+        return hits
+    top = [int(r) for r in hits[:SEARCH_LIMIT]]
+    st.selectbox(f"{len(hits):,} matches — open a project in the workflow",
+                 [None] + top, index=0, key="search_pick", on_change=_open_search_pick,
+                 format_func=lambda r: "Choose a project" if r is None else _search_label(r))
+    return hits
+
 # ──────────────────────────────────────────────────────────────────────────────
-# KPI + Snapshot dashboard
+# Project table — sorted/paged server-side, only the visible page is sent
 # ──────────────────────────────────────────────────────────────────────────────
-def render_kpis(df: pd.DataFrame):
+TABLE_COLUMNS = ["Project_ID","Project_Name","Developer","Owner_Class","Project_Type",
+                 "Capacity_MW","State","Checkpoint","Milestone",
+                 "Milestone_Start_Date","Date"]
+TABLE_PAGE_SIZES = [25, 50, 100, 250]
+
+@st.cache_resource(show_spinner=False)
+def get_sort_index(version: str, _df: pd.DataFrame):
+    return build_sort_index(_df, TABLE_COLUMNS)
+
+@st.fragment
+def render_project_table(rows):
+    # Fragment: sort/page widgets rerun only this block, not the charts below.
+    if not len(rows):
+        st.info("No projects for this selection.")
+        return
+    sort_index = get_sort_index(ASSIGNED_VERSION, assigned_df)
+    c1, c2, c3, c4 = st.columns([3, 2, 2, 2])
+    with c1:
+        sort_col = st.selectbox("Sort by", TABLE_COLUMNS, index=TABLE_COLUMNS.index("Capacity_MW"), key="tbl_sort")
+    with c2:
+        direction = st.selectbox("Order", ["Descending", "Ascending"], index=0, key="tbl_dir")
+    with c3:
+        page_size = st.selectbox("Rows per page", TABLE_PAGE_SIZES, index=1, key="tbl_page_size")
+    n_pages = page_count(len(rows), page_size)
+    if st.session_state.get("tbl_page", 1) > n_pages:
+        st.session_state["tbl_page"] = 1
+    with c4:
+        page = st.number_input(f"Page (of {n_pages:,})", min_value=1, max_value=n_pages,
+                               step=1, key="tbl_page")
+
+    ordered = sort_index.ordered(rows, sort_col, descending=(direction == "Descending"))
+    visible = page_slice(ordered, int(page), page_size)
+    st.dataframe(assigned_df.iloc[visible][TABLE_COLUMNS].reset_index(drop=True), use_container_width=True)
+    start = (int(page) - 1) * page_size
+    st.caption(f"Rows {start + 1:,}–{start + len(visible):,} of {len(rows):,}")
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Time rollups (week / month / quarter / FY × COD / milestone start)
+# ──────────────────────────────────────────────────────────────────────────────
+def _plot(fig):
+    if fig is not None:
+        st.plotly_chart(fig, use_container_width=True)
+
+@st.cache_data(show_spinner=False)
+def get_time_rollups(version: str, _df: pd.DataFrame) -> pd.DataFrame:
+    return build_time_rollups(_df)
+
+@st.fragment
+def render_time_rollup(df: pd.DataFrame, rollup_filters: dict | None):
+    # With filters the series comes from the precomputed cube; without them `df`
+    # is an arbitrary subset (e.g. search hits) and is rolled up on the fly.
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        gran = st.selectbox("Granularity", GRANULARITIES, index=GRANULARITIES.index("Month"), key="ts_gran")
+    with c2:
+        basis = st.selectbox("Date basis", list(DATE_BASES), index=0, key="ts_basis")
+    with c3:
+        metric = st.selectbox("Measure", ["Projects", "Capacity_MW"], index=0, key="ts_metric",
+                              format_func=lambda m: "Capacity (MW)" if m == "Capacity_MW" else m)
+    if rollup_filters is not None:
+        cube = get_time_rollups(ASSIGNED_VERSION, assigned_df)
+    else:
+        cube = build_time_rollups(df)
+    ts_agg = query_rollup(cube, basis, gran, rollup_filters)
+    if ts_agg.empty:
+        st.info("No dated projects for this selection.")
+        return
+    from src.charts import time_rollup_fig
+    _plot(time_rollup_fig(ts_agg, metric, basis, gran))
+
+# ──────────────────────────────────────────────────────────────────────────────
+# State choropleth — geometry simplified once and fetched once by the browser;
+# reruns only send the per-state aggregates
+# ──────────────────────────────────────────────────────────────────────────────
+_state_map = components.declare_component("state_map", path=str(MAP_COMPONENT_DIR))
+
+@st.cache_resource(show_spinner=False)
+def get_state_geometry(version: str):
+    # writes src/components/state_map/india_states.simplified.json on first use
+    return ensure_simplified_geometry(norm_key)
+
+def render_state_map(df: pd.DataFrame):
+    geo_version = f"{dataset_version(str(GEOJSON_PATH))}-{SIMPLIFIED_FORMAT}"
+    if get_state_geometry(geo_version) is None:
+        st.info("Add the India states GeoJSON as 'assets/india_states.geojson' to show the state map.")
+        return
+    agg = (df.dropna(subset=["State_Name"])
+             .assign(Capacity_MW=lambda d: pd.to_numeric(d["Capacity_MW"], errors="coerce").fillna(0.0))
+             .groupby("State_Name")
+             .agg(capacity=("Capacity_MW", "sum"), projects=("Project_Row", "sum")))
+    values = {norm_key(name): {"name": name, "capacity": round(float(r.capacity), 1), "projects": int(r.projects)}
+              for name, r in agg.iterrows()}
+    unmapped = int(df["State_Name"].isna().sum())
+    selected = st.session_state.get("selected_state")
+    _state_map(values=values, selected=norm_key(selected) if selected else None,
+               geo_version=geo_version,
+               caption=f"{unmapped:,} projects without a recognisable state" if unmapped else "",
+               key="state_map", default=None)
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Schedule risk (COD slippage / milestone dwell)
+# ──────────────────────────────────────────────────────────────────────────────
+@st.cache_data(show_spinner=False)
+def get_schedule_risk(version: str, today: str, _df: pd.DataFrame) -> pd.DataFrame:
+    # computed once per data version and day over the full table; views slice it by index
+    return compute_schedule_risk(_df, CHECKPOINT_ORDER, today=pd.Timestamp(today).date())
+
+def render_risk(df: pd.DataFrame):
+    risk = get_schedule_risk(ASSIGNED_VERSION, datetime.now().date().isoformat(), assigned_df).loc[df.index]
+    st.markdown("<h2 class='section-title'>Schedule risk</h2>", unsafe_allow_html=True)
     cap = pd.to_numeric(df["Capacity_MW"], errors="coerce").fillna(0.0)
-    total_projects = int(df["Project_Row"].sum()) if "Project_Row" in df.columns else len(df)
-    total_capacity = int(cap.sum())
-    avg_capacity   = round(float(cap.mean()), 2) if len(cap) else 0.0
-    type_counts = df["Project_Type"].value_counts(dropna=True)
-    solar_n  = int(type_counts.get("Solar", 0))
-    wind_n   = int(type_counts.get("Wind", 0))
-    hybrid_n = int(type_counts.get("Hybrid", 0))
-
-    c1, c2, c3, c4, c5 = st.columns(5)
-    for c, label, value in [
-        (c1, "Total Projects", f"{total_projects:,}"),
-        (c2, "Total Capacity (MW)", f"{total_capacity:,}"),
-        (c3, "Avg Capacity / Project", f"{avg_capacity}"),
-        (c4, "Solar Projects", f"{solar_n:,}"),
-        (c5, "Wind / Hybrid", f"{wind_n:,} / {hybrid_n:,}"),
-    ]:
+    n_risk = int(risk["At_Risk"].sum())
+    share = (n_risk / len(risk) * 100) if len(risk) else 0.0
+    med_cod = risk["Days_To_COD"].median()
+    med_dwell = risk["Days_In_Milestone"].median()
+    _kpi_cards([
+        ("At-risk Projects", f"{n_risk:,} ({share:.0f}%)"),
+        ("At-risk Capacity (MW)", f"{int(cap[risk['At_Risk']].sum()):,}"),
+        ("Median Days to COD", "—" if pd.isna(med_cod) else f"{int(med_cod):,}"),
+        ("Median Days in Milestone", "—" if pd.isna(med_dwell) else f"{int(med_dwell):,}"),
+    ])
+
+    group = st.selectbox("Group risk by", list(RISK_GROUPS), index=0, key="risk_group")
+    agg = aggregate_risk(df, risk, RISK_GROUPS[group])
+    if not agg.empty and agg["At_Risk"].sum() > 0:
+        from src.charts import risk_by_group_fig
+        _plot(risk_by_group_fig(agg[agg["At_Risk"] > 0].head(15), group, RISK_GROUPS[group]))
+    reasons = risk.loc[risk["At_Risk"], "Risk_Reason"].value_counts()
+    no_data = int((risk["Risk_Reason"] == NO_PROGRESS).sum())
+    notes = [f"{k}: {v:,}" for k, v in reasons.items()]
+    if no_data:
+        notes.append(f"{NO_PROGRESS} (not counted): {no_data:,}")
+    if notes:
+        st.caption(" · ".join(notes))
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Changes since last quarter (hash diff of two load_uc_clean outputs)
+# ──────────────────────────────────────────────────────────────────────────────
+@st.cache_data(show_spinner=False)
+def get_report_diff(cur_version: str, prev_version: str, _cur: pd.DataFrame, _prev: pd.DataFrame) -> dict:
+    return diff_reports(_prev, _cur)
+
+def render_quarter_changes():
+    prev_file = find_previous_uc_file(UC_FILE) if UC_FILE else None
+    with st.expander("Changes since last quarter", expanded=False):
+        if not prev_file:
+            st.info(f"Add an earlier quarterly report (…_as_on_<Month>_<Year>.xlsx) to `{REPORTS_DIR}/` to compare.")
+            return
+        prev_version = dataset_version(prev_file)
+        try:
+            prev_df = load_uc_clean(prev_file, prev_version)
+        except Exception as e:
+            st.error(f"Could not load previous report: {e}")
+            return
+        d = get_report_diff(UC_VERSION, prev_version, uc_df, prev_df)
+        added_mw = pd.to_numeric(d["added"]["Capacity_MW"], errors="coerce").sum()
+        removed_mw = pd.to_numeric(d["removed"]["Capacity_MW"], errors="coerce").sum()
+        delta_mw = pd.to_numeric(d["changed"]["Capacity_Delta_MW"], errors="coerce").sum()
+        st.caption(f"{Path(prev_file).name} → {Path(UC_FILE).name}")
+        _kpi_cards([
+            ("Added", f"{len(d['added']):,} (+{int(added_mw):,} MW)"),
+            ("Removed", f"{len(d['removed']):,} (−{int(removed_mw):,} MW)"),
+            ("Changed", f"{len(d['changed']):,}"),
+            ("Net Capacity Change (MW)", f"{int(added_mw - removed_mw + delta_mw):+,}"),
+        ])
+        t_add, t_rem, t_chg = st.tabs(["Added", "Removed", "Changed"])
+        with t_add:
+            st.dataframe(d["added"], use_container_width=True)
+        with t_rem:
+            st.dataframe(d["removed"], use_container_width=True)
+        with t_chg:
+            st.dataframe(d["changed"], use_container_width=True)
+
+# ──────────────────────────────────────────────────────────────────────────────
+# KPI + Snapshot dashboard
+# ──────────────────────────────────────────────────────────────────────────────
+def _kpi_cards(items):
+    # one row of KPI cards, one column per (label, value)
+    for c, (label, value) in zip(st.columns(len(items)), items):
         with c:
             st.markdown(
                 f"<div class='card'><div class='kpi-label'>{label}</div><div class='kpi-value'>{value}</div></div>",
                 unsafe_allow_html=True
             )
 
-def render_snapshot(df: pd.DataFrame):
+def render_kpis(df: pd.DataFrame):
+    k = kpi_summary(df)
+    _kpi_cards([
+        ("Total Projects", f"{k['total_projects']:,}"),
+        ("Total Capacity (MW)", f"{k['total_capacity_mw']:,}"),
+        ("Avg Capacity / Project", f"{k['avg_capacity_mw']}"),
+        ("Solar Projects", f"{k['solar_projects']:,}"),
+        ("Wind / Hybrid", f"{k['wind_projects']:,} / {k['hybrid_projects']:,}"),
+    ])
+
+def render_snapshot(df: pd.DataFrame, rollup_filters: dict | None = None):
+    # rollup_filters: the dim filters that produced `df` (lets the time chart use
+    # the precomputed cube); None when `df` can't be described that way.
     if df.empty:
         return
+    # plotly (via src.charts) is first imported here, after the workflow has painted
+    from src.charts import (capacity_by_type_fig, capacity_vs_projects_fig, owner_class_fig,
+                            state_capacity_fig, state_projects_fig, top_developers_fig,
+                            type_within_top_states_fig)
     st.markdown("<h2 class='section-title'>RE projects under construction snapshot</h2>", unsafe_allow_html=True)
 
     # Inline dashboard filter — manual choices
@@ -521,99 +636,51 @@ def render_snapshot(df: pd.DataFrame):
     fdf = df.copy()
     if ft != "Choose an option":
         fdf = fdf[fdf["Project_Type"] == ft]
+        if rollup_filters is not None:
+            rollup_filters = {**rollup_filters, "Project_Type": ft}
+    map_df = fdf   # the map keeps every state coloured; the rest follows the clicked state
+    if st.session_state.get("selected_state"):
+        fdf = fdf[fdf["State_Name"] == st.session_state.get("selected_state")]
+        rollup_filters = None
 
     render_kpis(fdf)
 
     # Row 1
     r1c1, r1c2 = st.columns(2)
     with r1c1:
-        cap_type = (fdf.groupby("Project_Type", as_index=False)["Capacity_MW"].sum()
-                      .sort_values("Capacity_MW", ascending=False))
-        if not cap_type.empty:
-            cap_type["Capacity_MW"] = pd.to_numeric(cap_type["Capacity_MW"], errors="coerce").fillna(0.0)
-            fig = px.pie(cap_type, names="Project_Type", values="Capacity_MW", hole=0.45,
-                         title="Capacity share by Project Type")
-            fig.update_layout(margin=dict(l=6,r=6,t=40,b=6), height=360)
-            st.plotly_chart(fig, use_container_width=True)
+        _plot(capacity_by_type_fig(fdf))
     with r1c2:
-        cls = (fdf.groupby("Owner_Class", as_index=False)
-                 .agg(Capacity_MW=("Capacity_MW","sum"), Projects=("Project_Row","sum")))
-        if not cls.empty:
-            cls["Capacity_MW"] = pd.to_numeric(cls["Capacity_MW"], errors="coerce").fillna(0.0)
-            fig = px.bar(cls, x="Owner_Class", y="Capacity_MW", text="Projects",
-                         title="CPSU vs Private (Capacity with projects count)")
-            fig.update_traces(textposition="outside")
-            fig.update_layout(margin=dict(l=6,r=6,t=40,b=6), height=360)
-            st.plotly_chart(fig, use_container_width=True)
+        _plot(owner_class_fig(fdf))
+
+    # State map
+    render_state_map(map_df)
 
     # Row 2
     r2c1, r2c2 = st.columns(2)
     with r2c1:
-        state_cap = (fdf.groupby("State", as_index=False)["Capacity_MW"].sum()
-                       .sort_values("Capacity_MW", ascending=False))
-        if not state_cap.empty:
-            state_cap["Capacity_MW"] = pd.to_numeric(state_cap["Capacity_MW"], errors="coerce").fillna(0.0)
-            fig = px.bar(state_cap, x="State", y="Capacity_MW", title="Capacity by State")
-            fig.update_layout(margin=dict(l=6,r=6,t=40,b=6), height=380)
-            st.plotly_chart(fig, use_container_width=True)
+        _plot(state_capacity_fig(fdf))
     with r2c2:
-        state_proj = (fdf.groupby("State", as_index=False)["Project_Row"].sum()
-                        .rename(columns={"Project_Row":"Projects"})
-                        .sort_values("Projects", ascending=False))
-        if not state_proj.empty:
-            fig = px.bar(state_proj, x="State", y="Projects", title="Projects by State")
-            fig.update_layout(margin=dict(l=6,r=6,t=40,b=6), height=380)
-            st.plotly_chart(fig, use_container_width=True)
+        _plot(state_projects_fig(fdf))
 
     # Row 3
     r3c1, r3c2 = st.columns(2)
     with r3c1:
-        dev_cap = (fdf.assign(Developer_display=fdf["Developer"].fillna(fdf["Developer_norm"]))
-                     .groupby("Developer_display", as_index=False)["Capacity_MW"].sum()
-                     .sort_values("Capacity_MW", ascending=False))
-        if not dev_cap.empty:
-            dev_cap["Capacity_MW"] = pd.to_numeric(dev_cap["Capacity_MW"], errors="coerce").fillna(0.0)
-            fig = px.bar(dev_cap.head(15), x="Capacity_MW", y="Developer_display",
-                         orientation="h", title="Top Developers by Capacity (MW)")
-            fig.update_layout(yaxis_title="Developer", xaxis_title="Capacity (MW)",
-                              margin=dict(l=6,r=6,t=40,b=6), height=420)
-            st.plotly_chart(fig, use_container_width=True)
+        _plot(top_developers_fig(fdf))
     with r3c2:
-        if "Date" in fdf.columns and fdf["Date"].notna().any():
-            ts = fdf.dropna(subset=["Date"]).copy()
-            ts["Month"] = pd.to_datetime(ts["Date"]).dt.to_period("M").dt.to_timestamp()
-            ts_agg = ts.groupby("Month", as_index=False)["Project_Row"].sum().rename(columns={"Project_Row":"Projects"})
-            if not ts_agg.empty:
-                fig = px.line(ts_agg, x="Month", y="Projects", markers=True, title="Projects over time")
-                fig.update_layout(margin=dict(l=6,r=6,t=40,b=6), height=420)
-                st.plotly_chart(fig, use_container_width=True)
+        render_time_rollup(fdf, rollup_filters)
 
     # Row 4
-    top_states = (fdf.groupby("State", as_index=False)["Capacity_MW"].sum()
-                    .sort_values("Capacity_MW", ascending=False).head(10)["State"])
-    stacked = (fdf[fdf["State"].isin(top_states)]
-                .groupby(["State","Project_Type"], as_index=False)["Capacity_MW"].sum())
-    if not stacked.empty:
-        stacked["Capacity_MW"] = pd.to_numeric(stacked["Capacity_MW"], errors="coerce").fillna(0.0)
-        fig = px.bar(stacked, x="State", y="Capacity_MW", color="Project_Type",
-                     title="Capacity by Type within Top States", barmode="stack")
-        fig.update_layout(margin=dict(l=6,r=6,t=40,b=6), height=380)
-        st.plotly_chart(fig, use_container_width=True)
+    _plot(type_within_top_states_fig(fdf))
 
     # Row 5
-    sp = (fdf.groupby("State", as_index=False)
-            .agg(Projects=("Project_Row","sum"), Capacity_MW=("Capacity_MW","sum")))
-    if not sp.empty:
-        sp["Capacity_MW"] = pd.to_numeric(sp["Capacity_MW"], errors="coerce").fillna(0.0).astype(float)
-        fig = px.scatter(sp, x="Projects", y="Capacity_MW", size="Capacity_MW",
-                         hover_name="State", title="Capacity vs Projects by State")
-        fig.update_layout(margin=dict(l=6,r=6,t=40,b=6), height=380)
-        st.plotly_chart(fig, use_container_width=True)
+    _plot(capacity_vs_projects_fig(fdf))
+
+    render_risk(fdf)
 
     # Export
     st.download_button(
         "Download filtered projects (CSV)",
-        data=fdf[["Project_Name","Developer","Owner_Class","Project_Type",
+        data=fdf[["Project_ID","Project_Name","Developer","Owner_Class","Project_Type",
                   "Capacity_MW","State","Checkpoint","Milestone",
                   "Milestone_Start_Date","Date"]].to_csv(index=False).encode("utf-8"),
         file_name="under_construction_projects_filtered.csv",
@@ -625,31 +692,40 @@ def render_snapshot(df: pd.DataFrame):
 # PAGE
 # ──────────────────────────────────────────────────────────────────────────────
 if not milestones_df.empty and not assigned_df.empty and CHECKPOINT_ORDER:
-    render_checkpoints_row()
+    with search_slot.container():
+        search_hits = render_search()
+    with workflow_slot.container():
+        render_checkpoints_row()
 
     if st.session_state.get("selected_checkpoint"):
         render_milestones_grid(st.session_state.get("selected_checkpoint"), cols_per_row=4)
 
     st.markdown("<br>", unsafe_allow_html=True)
 
-    current_df = assigned_df.copy()
+    # clicked state on the map (None when cleared)
+    st.session_state.selected_state = st.session_state.get("state_map")
+
+    current_df = assigned_df
+    if search_hits is not None:
+        current_df = current_df[current_df.index.isin(search_hits)]
     if st.session_state.get("selected_checkpoint"):
         current_df = current_df[current_df["Checkpoint"] == st.session_state.get("selected_checkpoint")]
     if st.session_state.get("selected_milestone"):
         current_df = current_df[current_df["Milestone"] == st.session_state.get("selected_milestone")]
-        for c in ["Checkpoint","Milestone"]:
-            if c in current_df.columns:
-                current_df[c] = current_df[c].fillna("Unassigned").replace({"nan":"Unassigned"})
-        st.dataframe(
-            current_df[["Project_Name","Developer","Owner_Class","Project_Type",
-                        "Capacity_MW","State","Checkpoint","Milestone",
-                        "Milestone_Start_Date","Date"]].reset_index(drop=True),
-            use_container_width=True
-        )
-
-    render_snapshot(current_df)
+        # Checkpoint/Milestone are already "Unassigned"-filled on assigned_df
+        table_df = current_df
+        if st.session_state.get("selected_state"):
+            table_df = table_df[table_df["State_Name"] == st.session_state.get("selected_state")]
+        render_project_table(table_df.index.to_numpy())
+
+    render_snapshot(current_df, rollup_filters=None if search_hits is not None else {
+        "Checkpoint": st.session_state.get("selected_checkpoint"),
+        "Milestone": st.session_state.get("selected_milestone"),
+    })
+    render_quarter_changes()
 
 else:
+    workflow_slot.empty()
     if milestones_df.empty:
         st.info("Add 'Milestones in RE projects.xlsx' (Sheet1 with Step No / Checkpoints / Milestones).")
     if assigned_df.empty:
@@ -739,7 +815,12 @@ for key in ("selected_checkpoint", "selected_milestone", "selected_state"):
             log_event("state_change", key=key, value=str(safe))
             st.session_state[shadow] = cur
 
-_prune_old_logs()
+@st.cache_resource(show_spinner=False)
+def _prune_old_logs_once(day: str):
+    # retention sweep once per process per day, not on every rerun
+    _prune_old_logs()
+
+_prune_old_logs_once(datetime.now(IST).date().isoformat())
 
 # ===== optional: daily/manual snapshot if this file is executed directly with a different name =====
 if __name__ == "__main__" and "daily_log_snapshot" in os.path.basename(__file__):
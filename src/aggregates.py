@@ -0,0 +1,45 @@
+# src/aggregates.py
+# The numbers behind the KPI strip and the snapshot charts, as plain pandas so
+# the dashboard and tools/api_server.py report exactly the same figures.
+
+import pandas as pd
+
+# API dimension name → project-table column
+AGG_DIMS = {
+    "state": "State_Name",
+    "type": "Project_Type",
+    "owner": "Owner_Class",
+    "checkpoint": "Checkpoint",
+    "milestone": "Milestone",
+    "developer": "Developer_Canonical",
+}
+
+
+def apply_filters(df: pd.DataFrame, filters: dict) -> pd.DataFrame:
+    """Keep rows where every `column: value` in `filters` matches (None / "" = no filter)."""
+    mask = pd.Series(True, index=df.index)
+    for col, val in filters.items():
+        if val not in (None, "") and col in df.columns:
+            mask &= df[col] == val
+    return df[mask]
+
+
+def kpi_summary(df: pd.DataFrame) -> dict:
+    cap = pd.to_numeric(df["Capacity_MW"], errors="coerce").fillna(0.0)
+    type_counts = df["Project_Type"].value_counts(dropna=True)
+    return {
+        "total_projects": int(df["Project_Row"].sum()) if "Project_Row" in df.columns else len(df),
+        "total_capacity_mw": int(cap.sum()),
+        "avg_capacity_mw": round(float(cap.mean()), 2) if len(cap) else 0.0,
+        "solar_projects": int(type_counts.get("Solar", 0)),
+        "wind_projects": int(type_counts.get("Wind", 0)),
+        "hybrid_projects": int(type_counts.get("Hybrid", 0)),
+    }
+
+
+def group_totals(df: pd.DataFrame, column: str) -> pd.DataFrame:
+    """Projects and Capacity_MW per `column` value, largest capacity first."""
+    out = (df.assign(Capacity_MW=pd.to_numeric(df["Capacity_MW"], errors="coerce").fillna(0.0))
+             .groupby(column, as_index=False)
+             .agg(Projects=("Project_Row", "sum"), Capacity_MW=("Capacity_MW", "sum")))
+    return out.sort_values("Capacity_MW", ascending=False).reset_index(drop=True)
@@ -0,0 +1,138 @@
+# src/charts.py
+# Snapshot chart definitions (plotly figures, no streamlit). render_snapshot in
+# app.py places them in its grid; tools/build_reports.py writes the same figures
+# into static per-state / per-checkpoint pages.
+#
+# Every builder takes the filtered project table and returns a figure, or None
+# when there is nothing to draw.
+
+import pandas as pd
+import plotly.express as px
+
+MARGIN = dict(l=6, r=6, t=40, b=6)
+
+
+def capacity_by_type_fig(fdf: pd.DataFrame):
+    cap_type = (fdf.groupby("Project_Type", as_index=False)["Capacity_MW"].sum()
+                  .sort_values("Capacity_MW", ascending=False))
+    if cap_type.empty:
+        return None
+    cap_type["Capacity_MW"] = pd.to_numeric(cap_type["Capacity_MW"], errors="coerce").fillna(0.0)
+    fig = px.pie(cap_type, names="Project_Type", values="Capacity_MW", hole=0.45,
+                 title="Capacity share by Project Type")
+    fig.update_layout(margin=MARGIN, height=360)
+    return fig
+
+
+def owner_class_fig(fdf: pd.DataFrame):
+    cls = (fdf.groupby("Owner_Class", as_index=False)
+             .agg(Capacity_MW=("Capacity_MW","sum"), Projects=("Project_Row","sum")))
+    if cls.empty:
+        return None
+    cls["Capacity_MW"] = pd.to_numeric(cls["Capacity_MW"], errors="coerce").fillna(0.0)
+    fig = px.bar(cls, x="Owner_Class", y="Capacity_MW", text="Projects",
+                 title="CPSU vs Private (Capacity with projects count)")
+    fig.update_traces(textposition="outside")
+    fig.update_layout(margin=MARGIN, height=360)
+    return fig
+
+
+def state_capacity_fig(fdf: pd.DataFrame):
+    state_cap = (fdf.groupby("State_Name", as_index=False)["Capacity_MW"].sum()
+                   .rename(columns={"State_Name": "State"})
+                   .sort_values("Capacity_MW", ascending=False))
+    if state_cap.empty:
+        return None
+    state_cap["Capacity_MW"] = pd.to_numeric(state_cap["Capacity_MW"], errors="coerce").fillna(0.0)
+    fig = px.bar(state_cap, x="State", y="Capacity_MW", title="Capacity by State")
+    fig.update_layout(margin=MARGIN, height=380)
+    return fig
+
+
+def state_projects_fig(fdf: pd.DataFrame):
+    state_proj = (fdf.groupby("State_Name", as_index=False)["Project_Row"].sum()
+                    .rename(columns={"State_Name": "State", "Project_Row":"Projects"})
+                    .sort_values("Projects", ascending=False))
+    if state_proj.empty:
+        return None
+    fig = px.bar(state_proj, x="State", y="Projects", title="Projects by State")
+    fig.update_layout(margin=MARGIN, height=380)
+    return fig
+
+
+def top_developers_fig(fdf: pd.DataFrame):
+    dev_cap = (fdf.assign(Developer_ID=fdf["Developer_ID"].fillna(""),
+                          Developer_display=fdf["Developer_Canonical"].fillna(fdf["Developer_norm"]))
+                 .groupby(["Developer_ID","Developer_display"], as_index=False)["Capacity_MW"].sum()
+                 .sort_values("Capacity_MW", ascending=False))
+    if dev_cap.empty:
+        return None
+    dev_cap["Capacity_MW"] = pd.to_numeric(dev_cap["Capacity_MW"], errors="coerce").fillna(0.0)
+    fig = px.bar(dev_cap.head(15), x="Capacity_MW", y="Developer_display",
+                 orientation="h", title="Top Developers by Capacity (MW)")
+    fig.update_layout(yaxis_title="Developer", xaxis_title="Capacity (MW)",
+                      margin=MARGIN, height=420)
+    return fig
+
+
+def time_rollup_fig(ts_agg: pd.DataFrame, metric: str, basis: str, gran: str):
+    if ts_agg.empty:
+        return None
+    title = f"{'Capacity (MW)' if metric == 'Capacity_MW' else 'Projects'} over time — {basis}, by {gran.lower()}"
+    fig = px.line(ts_agg, x="Period", y=metric, markers=True, title=title,
+                  hover_name="Label", hover_data={"Period": False, "Projects": True, "Capacity_MW": ":,.0f"})
+    fig.update_layout(margin=MARGIN, height=360)
+    return fig
+
+
+def type_within_top_states_fig(fdf: pd.DataFrame):
+    top_states = (fdf.groupby("State_Name", as_index=False)["Capacity_MW"].sum()
+                    .sort_values("Capacity_MW", ascending=False).head(10)["State_Name"])
+    stacked = (fdf[fdf["State_Name"].isin(top_states)]
+                .groupby(["State_Name","Project_Type"], as_index=False)["Capacity_MW"].sum()
+                .rename(columns={"State_Name": "State"}))
+    if stacked.empty:
+        return None
+    stacked["Capacity_MW"] = pd.to_numeric(stacked["Capacity_MW"], errors="coerce").fillna(0.0)
+    fig = px.bar(stacked, x="State", y="Capacity_MW", color="Project_Type",
+                 title="Capacity by Type within Top States", barmode="stack")
+    fig.update_layout(margin=MARGIN, height=380)
+    return fig
+
+
+def capacity_vs_projects_fig(fdf: pd.DataFrame):
+    sp = (fdf.groupby("State_Name", as_index=False)
+            .agg(Projects=("Project_Row","sum"), Capacity_MW=("Capacity_MW","sum"))
+            .rename(columns={"State_Name": "State"}))
+    if sp.empty:
+        return None
+    sp["Capacity_MW"] = pd.to_numeric(sp["Capacity_MW"], errors="coerce").fillna(0.0).astype(float)
+    fig = px.scatter(sp, x="Projects", y="Capacity_MW", size="Capacity_MW",
+                     hover_name="State", title="Capacity vs Projects by State")
+    fig.update_layout(margin=MARGIN, height=380)
+    return fig
+
+
+def risk_by_group_fig(top: pd.DataFrame, group: str, column: str):
+    """`top`: aggregate_risk rows with At_Risk > 0."""
+    if top.empty:
+        return None
+    fig = px.bar(top, x="At_Risk", y=column, orientation="h", text="At_Risk_Share",
+                 hover_data=["Projects", "At_Risk_MW", "Median_Days_To_COD", "Median_Days_In_Milestone"],
+                 title=f"At-risk projects by {group.lower()} (label = share of projects)")
+    fig.update_traces(texttemplate="%{text:.0%}", textposition="outside")
+    fig.update_layout(yaxis_title=group, xaxis_title="At-risk projects", yaxis=dict(autorange="reversed"),
+                      margin=MARGIN, height=420)
+    return fig
+
+
+# Static-report order (name → builder); the dashboard lays the same builders out by hand
+SNAPSHOT_CHARTS = [
+    ("capacity_by_type", capacity_by_type_fig),
+    ("owner_class", owner_class_fig),
+    ("state_capacity", state_capacity_fig),
+    ("state_projects", state_projects_fig),
+    ("top_developers", top_developers_fig),
+    ("type_within_top_states", type_within_top_states_fig),
+    ("capacity_vs_projects", capacity_vs_projects_fig),
+]
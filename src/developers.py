@@ -0,0 +1,260 @@
+# src/developers.py
+# Developer entity resolution: "NTPC Ltd", "NTPC Limited" and "N.T.P.C." → one
+# canonical developer with a stable id.
+#
+# Stages:
+#   1) developer_key()   deterministic key (case, punctuation, dotted acronyms,
+#                        legal suffixes) — most aliases collapse here for free
+#   2) blocking          unique keys are bucketed by their rarest tokens, so fuzzy
+#                        comparisons only run inside small blocks, never all-pairs;
+#                        blocks above MAX_BLOCK are compared as a sorted
+#                        neighbourhood (each key vs. its WINDOW nearest), so the
+#                        pair count stays linear in the number of keys
+#   3) fuzzy merge       difflib ratio inside each block, clustered via union-find
+#   4) canonical pick    most frequent raw spelling in the cluster
+#   5) ids               keys seen before keep the Developer_ID recorded in the
+#                        id registry (DEVELOPER_IDS_FILE), so a cluster that grows
+#                        a new spelling keeps its id; new clusters get the hash of
+#                        their smallest key and are appended to the registry
+
+import hashlib
+import os
+import re
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.utils.filelock import file_lock
+
+LEGAL_SUFFIXES = {
+    "ltd", "limited", "pvt", "private", "llp", "inc", "corp", "corporation",
+    "co", "company", "plc", "llc", "the", "ms", "p",
+}
+# SPV series ("Hybrid Five", "Power XIII", "Park 2") are separate legal entities
+NUMBER_WORDS = {
+    "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten",
+    "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen",
+    "eighteen", "nineteen", "twenty", "thirty", "forty", "fifty", "sixty",
+    "seventy", "eighty", "ninety", "hundred", "first", "second", "third", "fourth", "fifth",
+}
+_ROMAN = re.compile(r"^l?x{0,3}(ix|iv|v?i{0,3})$")
+FUZZY_THRESHOLD = 0.92
+TOKEN_THRESHOLD = 0.8
+MAX_BLOCK = 64           # larger blocks are compared as a sorted neighbourhood
+WINDOW = 12              # neighbours per key in an oversized block (per sort order)
+
+_DOTTED_ACRONYM = re.compile(r"\b(?:[a-z]\.){2,}")
+
+
+def developer_key(name) -> str:
+    if name is None or (isinstance(name, float) and pd.isna(name)):
+        return ""
+    s = str(name).lower().strip().replace("&", " and ")
+    s = s.replace("m/s", " ")
+    s = _DOTTED_ACRONYM.sub(lambda m: m.group(0).replace(".", ""), s)   # n.t.p.c. → ntpc
+    s = re.sub(r"[^a-z0-9 ]", " ", s)
+    toks = [t for t in s.split() if t not in LEGAL_SUFFIXES]
+    return " ".join(toks)
+
+
+def developer_id(key: str) -> str:
+    return "DEV-" + hashlib.sha1(key.encode("utf-8")).hexdigest()[:10].upper()
+
+
+class _UnionFind:
+    def __init__(self, items):
+        self.parent = {x: x for x in items}
+
+    def find(self, x):
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            # smaller key wins so the root (and hence the id) is order-independent
+            if rb < ra:
+                ra, rb = rb, ra
+            self.parent[rb] = ra
+
+
+def _blocks(keys):
+    # Two keys can only match if they differ by near-spellings of the same
+    # tokens, so they share their rarest or second-rarest token unless both are
+    # misspelt. Single-token keys fall back to a 4-char prefix block.
+    df = Counter(t for k in keys for t in set(k.split()))
+    by_block = defaultdict(list)
+    for k in keys:
+        toks = sorted(set(k.split()), key=lambda t: (df[t], -len(t), t))
+        for t in toks[:2]:
+            by_block["t:" + t].append(k)
+        if len(toks) == 1:
+            by_block["p:" + k[:4]].append(k)
+    for label, members in by_block.items():
+        if len(members) >= 2:
+            yield label, sorted(set(members))
+
+
+def _block_pairs(label: str, block: list):
+    """Candidate pairs of one block, each at most once."""
+    if len(block) <= MAX_BLOCK:
+        for i, a in enumerate(block):
+            for b in block[i + 1:]:
+                yield a, b
+        return
+    # Sorted neighbourhood: order by the key without the shared block token, once
+    # forwards and once reversed (a typo early in the name still sorts close by
+    # its tail), and compare each key with the next WINDOW keys only.
+    tok = label[2:] if label.startswith("t:") else ""
+    rest = {k: " ".join(t for t in k.split() if t != tok) for k in block}
+    seen = set()                      # per block: at most 2 × WINDOW × len(block) pairs
+    for order in (sorted(block, key=rest.get), sorted(block, key=lambda k: rest[k][::-1])):
+        for i, a in enumerate(order):
+            for b in order[i + 1:i + 1 + WINDOW]:
+                pair = (a, b) if a < b else (b, a)
+                if pair not in seen:
+                    seen.add(pair)
+                    yield pair
+
+
+def _is_numberish(tok: str) -> bool:
+    return tok.isdigit() or tok in NUMBER_WORDS or bool(_ROMAN.match(tok))
+
+
+def _features(key: str):
+    toks = key.split()
+    numbers = tuple(re.findall(r"\d+", key)) + tuple(t for t in toks if _is_numberish(t))
+    return toks, frozenset(toks), numbers
+
+
+def _near(x: str, y: str, threshold: float) -> bool:
+    lx, ly = len(x), len(y)
+    if 2.0 * min(lx, ly) / (lx + ly) < threshold:      # == real_quick_ratio, without the object
+        return False
+    return SequenceMatcher(None, x, y, autojunk=False).ratio() >= threshold
+
+
+_BAG_CHARS = {c: i for i, c in enumerate("abcdefghijklmnopqrstuvwxyz0123456789 ")}
+
+
+def _char_bags(keys: list) -> np.ndarray:
+    bags = np.zeros((len(keys), len(_BAG_CHARS)), dtype=np.uint16)
+    for i, k in enumerate(keys):
+        for ch, n in Counter(k).items():
+            bags[i, _BAG_CHARS[ch]] = n
+    return bags
+
+
+def _quick_ok(bags: np.ndarray, lens: np.ndarray, ia: np.ndarray, ib: np.ndarray) -> np.ndarray:
+    # difflib's quick_ratio (shared characters, ignoring order) bounds ratio() from
+    # above, so pairs below the threshold here can never match — vectorized per block
+    shared = np.minimum(bags[ia], bags[ib]).sum(axis=1)
+    return 2.0 * shared >= FUZZY_THRESHOLD * (lens[ia] + lens[ib])
+
+
+def _similar(fa, fb, a: str, b: str) -> bool:
+    (ta, sa, na), (tb, sb, nb) = fa, fb
+    if len(ta) != len(tb) or na != nb:
+        return False
+    # Every token that differs must be a near-spelling of a token on the other
+    # side ("enrgy"/"energy"), not a different word ("beam"/"beta", "barmer"/"ap").
+    # Checked first: it is per-token and rejects most candidate pairs cheaply.
+    only_b = [t for t in tb if t not in sa]
+    for x in ta:
+        if x not in sb and not any(_near(x, y, TOKEN_THRESHOLD) for y in only_b):
+            return False
+    return _near(a, b, FUZZY_THRESHOLD)
+
+
+def _cluster_ids(root_of: dict, known_ids: dict) -> dict:
+    """
+    root → Developer_ID. A cluster containing registered keys keeps their id (the
+    one most of its keys carry, ties → smallest); otherwise hash of its root.
+    """
+    votes = defaultdict(Counter)
+    for k, r in root_of.items():
+        if k in known_ids:
+            votes[r][known_ids[k]] += 1
+    ids = {}
+    for r in set(root_of.values()):
+        v = votes.get(r)
+        ids[r] = min(v, key=lambda i: (-v[i], i)) if v else developer_id(r)
+    return ids
+
+
+def resolve_developers(names: pd.Series, known_ids: dict | None = None) -> pd.DataFrame:
+    """
+    Alias → canonical map for every distinct raw developer string in `names`.
+    Columns: Developer (raw alias), Developer_Key, Developer_Canonical, Developer_ID.
+    `known_ids` (Developer_Key → Developer_ID, see load_developer_ids) pins the
+    ids of clusters seen before.
+    """
+    raw = names.dropna().astype(str)
+    raw = raw[raw.str.strip() != ""]
+    counts = Counter(raw)
+    aliases = pd.DataFrame({"Developer": list(counts.keys())})
+    if aliases.empty:
+        return aliases.assign(Developer_Key=[], Developer_Canonical=[], Developer_ID=[])
+    aliases["Developer_Key"] = aliases["Developer"].map(developer_key)
+
+    keys = sorted(k for k in aliases["Developer_Key"].unique() if k)
+    uf = _UnionFind(keys)
+    feats = {k: _features(k) for k in keys}
+    pos = {k: i for i, k in enumerate(keys)}
+    bags, lens = _char_bags(keys), np.array([len(k) for k in keys])
+    for label, block in _blocks(keys):
+        pairs = np.array([(pos[a], pos[b]) for a, b in _block_pairs(label, block)], dtype=np.int64)
+        for ia, ib in pairs[_quick_ok(bags, lens, pairs[:, 0], pairs[:, 1])]:
+            a, b = keys[ia], keys[ib]
+            if uf.find(a) != uf.find(b) and _similar(feats[a], feats[b], a, b):
+                uf.union(a, b)
+
+    root_of = {k: uf.find(k) for k in keys}
+    aliases["_root"] = aliases["Developer_Key"].map(root_of).fillna(aliases["Developer_Key"])
+    aliases["_n"] = aliases["Developer"].map(counts)
+    # Canonical display = most used spelling in the cluster (ties → shortest, then alphabetical)
+    best = (aliases.assign(_len=aliases["Developer"].str.len())
+                   .sort_values(["_root", "_n", "_len", "Developer"], ascending=[True, False, True, True])
+                   .drop_duplicates("_root")
+                   .set_index("_root")["Developer"])
+    aliases["Developer_Canonical"] = aliases["_root"].map(best)
+    ids = _cluster_ids(root_of, known_ids or {})
+    aliases["Developer_ID"] = aliases["_root"].map(lambda r: ids.get(r) or developer_id(r))
+    return (aliases.drop(columns=["_root", "_n"])
+                   .sort_values(["Developer_Canonical", "Developer"])
+                   .reset_index(drop=True))
+
+
+# ── id registry ──────────────────────────────────────────────────────────────
+def load_developer_ids(path) -> dict:
+    """Developer_Key → Developer_ID recorded by earlier loads ({} when there is no registry yet)."""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    reg = pd.read_csv(path, dtype=str).dropna(subset=["Developer_Key", "Developer_ID"])
+    return dict(zip(reg["Developer_Key"], reg["Developer_ID"]))
+
+
+def resolve_developers_registered(names: pd.Series, path) -> pd.DataFrame:
+    """resolve_developers() with ids pinned by the registry at `path`; new keys are added to it."""
+    path = Path(path)
+    # the app and the headless tools may register new keys at the same time
+    with file_lock(path.with_name(path.name + ".lock")):
+        known = load_developer_ids(path)
+        out = resolve_developers(names, known)
+        new = (out.loc[~out["Developer_Key"].isin(known.keys()) & (out["Developer_Key"] != ""),
+                       ["Developer_Key", "Developer_ID"]]
+                  .drop_duplicates("Developer_Key"))
+        if not new.empty:
+            reg = pd.concat([pd.DataFrame({"Developer_Key": list(known), "Developer_ID": list(known.values())}), new],
+                            ignore_index=True).sort_values("Developer_Key")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            reg.to_csv(tmp, index=False)
+            os.replace(tmp, path)
+    return out
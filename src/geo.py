@@ -0,0 +1,184 @@
+# src/geo.py
+# State geometry + state-name resolution for the choropleth.
+#
+# The bundled GeoJSON (assets/india_states.geojson; source and license in
+# assets/india_states.NOTICE.txt) is simplified (Douglas–Peucker), projected and
+# turned into SVG path strings ONCE; the result is cached next to the map
+# component as india_states.simplified.json and only rebuilt when the source
+# file changes. The browser fetches that file once, so reruns only ever ship
+# the per-state aggregates.
+
+import json
+import math
+from pathlib import Path
+
+import pandas as pd
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+GEOJSON_PATH = ROOT_DIR / "assets" / "india_states.geojson"
+MAP_COMPONENT_DIR = Path(__file__).resolve().parent / "components" / "state_map"
+SIMPLIFIED_PATH = MAP_COMPONENT_DIR / "india_states.simplified.json"
+SIMPLIFY_TOLERANCE = 0.02          # degrees (~2 km) — plenty for a state-level map
+VIEW_WIDTH = 1000
+SIMPLIFIED_FORMAT = 2              # bump when the cached file's shape/content rules change
+
+NAME_PROPERTIES = ("st_nm", "ST_NM", "NAME_1", "name", "NAME", "State", "STATE", "state_name")
+
+INDIA_STATES = [
+    "Andaman and Nicobar Islands", "Andhra Pradesh", "Arunachal Pradesh", "Assam", "Bihar",
+    "Chandigarh", "Chhattisgarh", "Dadra and Nagar Haveli and Daman and Diu", "Delhi", "Goa",
+    "Gujarat", "Haryana", "Himachal Pradesh", "Jammu and Kashmir", "Jharkhand", "Karnataka",
+    "Kerala", "Ladakh", "Lakshadweep", "Madhya Pradesh", "Maharashtra", "Manipur", "Meghalaya",
+    "Mizoram", "Nagaland", "Odisha", "Puducherry", "Punjab", "Rajasthan", "Sikkim",
+    "Tamil Nadu", "Telangana", "Tripura", "Uttar Pradesh", "Uttarakhand", "West Bengal",
+]
+
+# Abbreviations / old names seen in the quarterly sheets ("Dhar, MP", "Lakadiya, GJ")
+STATE_ALIASES = {
+    "ap": "Andhra Pradesh", "ar": "Arunachal Pradesh", "br": "Bihar",
+    "cg": "Chhattisgarh", "ct": "Chhattisgarh", "gj": "Gujarat", "hr": "Haryana",
+    "hp": "Himachal Pradesh", "jk": "Jammu and Kashmir", "jh": "Jharkhand", "ka": "Karnataka",
+    "kl": "Kerala", "mp": "Madhya Pradesh", "mh": "Maharashtra", "od": "Odisha",
+    "orissa": "Odisha", "pb": "Punjab", "rj": "Rajasthan", "tn": "Tamil Nadu",
+    "ts": "Telangana", "tg": "Telangana", "up": "Uttar Pradesh", "uk": "Uttarakhand",
+    "uttaranchal": "Uttarakhand", "wb": "West Bengal", "nct of delhi": "Delhi",
+    "pondicherry": "Puducherry", "jammu kashmir": "Jammu and Kashmir",
+    "dadra and nagar haveli": "Dadra and Nagar Haveli and Daman and Diu",
+    "daman and diu": "Dadra and Nagar Haveli and Daman and Diu",
+}
+
+
+def resolve_state_names(values: pd.Series, key_fn) -> pd.Series:
+    """
+    Canonical state name for free-text state/location values ("Bikaner, Rajasthan",
+    "State- Gujarat", "Dhar, MP"), joined through `key_fn` (the app's norm_key).
+    Work is done once per distinct value.
+    """
+    by_key = {key_fn(s): s for s in INDIA_STATES}
+    by_key.update({key_fn(k): v for k, v in STATE_ALIASES.items()})
+    longest_first = sorted((k for k in by_key if len(k) > 2), key=len, reverse=True)
+
+    def one(v):
+        k = key_fn(v)
+        if not k:
+            return pd.NA
+        if k in by_key:
+            return by_key[k]
+        padded = f" {k} "
+        for sk in longest_first:
+            if f" {sk} " in padded:
+                return by_key[sk]
+        for tok in reversed(k.split()):          # trailing abbreviation: "dhar mp"
+            if tok in by_key:
+                return by_key[tok]
+        return pd.NA
+
+    uniq = pd.Series(values.dropna().unique())
+    mapping = dict(zip(uniq, uniq.map(one)))
+    return values.map(mapping)
+
+
+# ── geometry ─────────────────────────────────────────────────────────────────
+def _dp(points, tol):
+    """Douglas–Peucker on a list of (x, y); iterative to avoid recursion limits."""
+    if len(points) < 3:
+        return points
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        a, b = stack.pop()
+        (x1, y1), (x2, y2) = points[a], points[b]
+        dx, dy = x2 - x1, y2 - y1
+        norm = math.hypot(dx, dy) or 1e-12
+        best, idx = 0.0, None
+        for i in range(a + 1, b):
+            x0, y0 = points[i]
+            d = abs(dy * x0 - dx * y0 + x2 * y1 - y2 * x1) / norm
+            if d > best:
+                best, idx = d, i
+        if idx is not None and best > tol:
+            keep[idx] = True
+            stack += [(a, idx), (idx, b)]
+    return [p for p, k in zip(points, keep) if k]
+
+
+def _simplify_ring(ring, tol):
+    """
+    Douglas–Peucker for a closed ring. The first and last points are equal, so the
+    ring is opened, split at the vertex farthest from its start and each half is
+    simplified against a real segment; the result is closed again.
+    """
+    pts = [tuple(pt[:2]) for pt in ring]
+    if len(pts) > 1 and pts[0] == pts[-1]:
+        pts = pts[:-1]
+    if len(pts) < 3:
+        return []
+    x0, y0 = pts[0]
+    far = max(range(1, len(pts)), key=lambda i: (pts[i][0] - x0) ** 2 + (pts[i][1] - y0) ** 2)
+    out = _dp(pts[:far + 1], tol)[:-1] + _dp(pts[far:] + [pts[0]], tol)
+    return out if len(out) >= 4 else []       # ≥ 3 distinct vertices + closing point
+
+
+def _polygons(geom):
+    if geom["type"] == "Polygon":
+        return [geom["coordinates"]]
+    if geom["type"] == "MultiPolygon":
+        return geom["coordinates"]
+    return []
+
+
+def simplify_states(geojson: dict, key_fn, tolerance: float = SIMPLIFY_TOLERANCE) -> dict:
+    """
+    GeoJSON FeatureCollection → {"format", "viewBox", "states": [{"key", "name", "d"}]}
+    in SVG space. `name` is the canonical state name (as in State_Name) when the
+    feature's name resolves, else the raw feature name; `key` is key_fn(name).
+    """
+    feats = []
+    for f in geojson.get("features", []):
+        props = f.get("properties") or {}
+        name = next((props[p] for p in NAME_PROPERTIES if props.get(p)), None)
+        if not name or not f.get("geometry"):
+            continue
+        rings = [r for poly in _polygons(f["geometry"]) for ring in poly
+                 if (r := _simplify_ring(ring, tolerance))]
+        if rings:
+            feats.append((str(name), rings))
+
+    # "NCT of Delhi", "Orissa", "RAJASTHAN" → the canonical State_Name the app filters on
+    raw = pd.Series([name for name, _ in feats], dtype=object)
+    canonical = resolve_state_names(raw, key_fn).where(lambda s: s.notna(), raw)
+    feats = [(str(c), rings) for c, (_, rings) in zip(canonical, feats)]
+
+    lats = [y for _, rings in feats for r in rings for _, y in r]
+    lat0 = math.radians((min(lats) + max(lats)) / 2) if lats else 0.0
+    kx = math.cos(lat0)
+    proj = [(name, [[(x * kx, -y) for x, y in r] for r in rings]) for name, rings in feats]
+    xs = [x for _, rings in proj for r in rings for x, _ in r] or [0, 1]
+    ys = [y for _, rings in proj for r in rings for _, y in r] or [0, 1]
+    scale = VIEW_WIDTH / ((max(xs) - min(xs)) or 1)
+    x0, y0 = min(xs), min(ys)
+
+    states = []
+    for name, rings in proj:
+        d = "".join(
+            "M" + "L".join(f"{(x - x0) * scale:.1f},{(y - y0) * scale:.1f}" for x, y in r) + "Z"
+            for r in rings
+        )
+        states.append({"key": key_fn(name), "name": name, "d": d})
+    height = (max(ys) - y0) * scale
+    return {"format": SIMPLIFIED_FORMAT, "viewBox": f"0 0 {VIEW_WIDTH} {height:.0f}", "states": states}
+
+
+def ensure_simplified_geometry(key_fn, src: Path = GEOJSON_PATH, out: Path = SIMPLIFIED_PATH) -> dict | None:
+    """Simplified geometry, rebuilt only when `src` is newer than the cached `out` (or its format is stale)."""
+    if not src.exists():
+        return None
+    if out.exists() and out.stat().st_mtime_ns >= src.stat().st_mtime_ns:
+        cached = json.loads(out.read_text(encoding="utf-8"))
+        if cached.get("format") == SIMPLIFIED_FORMAT:
+            return cached
+    data = simplify_states(json.loads(src.read_text(encoding="utf-8")), key_fn)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+    return data
@@ -0,0 +1,277 @@
+# src/loaders.py
+# Workbook loaders shared by the Streamlit app and the headless tools.
+#
+# Everything here is plain pandas (no streamlit import): app.py wraps these in
+# st.cache_data keyed by dataset_version(), tools/ call them directly. Paths are
+# relative to `root` (the app runs from the project root, so the default ".").
+
+import random
+import re
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+from src.developers import developer_key, resolve_developers_registered
+from src.geo import resolve_state_names
+from src.milestone_events import event_drop_files, join_current_state, sync_milestone_events
+from src.projects import assign_project_ids
+from src.report_diff import report_date
+from src.utils.versioning import dataset_version
+
+MILES_FILE = "Milestones in RE projects.xlsx"
+UC_FILE_CANDIDATES = [
+    "Quarterly_Report_on_Under_Construction_Renewable_Energy_Projects_as_on_June_2025.xlsx",
+    "Quarterly_Report_on_Under_Construction_Renewable_Energy_Projects_as_on_June_2025..xlsx",
+]
+REPORTS_DIR = "reports"           # earlier quarterly workbooks, for "changes since last quarter"
+EVENTS_DIR = "milestone_events"   # drops/ → event_log.csv + current_state.csv
+DEVELOPER_IDS_FILE = "data/developer_ids.csv"   # Developer_Key → Developer_ID (committed: Project_IDs build on it)
+
+
+# ── helpers ──────────────────────────────────────────────────────────────────
+def pickcol(cols, *candidates):
+    cols = [str(c) for c in cols]
+    low = {c.lower().strip(): c for c in cols}
+    for cand in candidates:
+        k = str(cand).lower().strip()
+        if k in low:
+            return low[k]
+    for cand in candidates:
+        k = str(cand).lower().strip()
+        for c in cols:
+            if k in c.lower():
+                return c
+    return None
+
+def norm_text_series(s: pd.Series) -> pd.Series:
+    s = s.astype(str).str.strip()
+    s = s.replace({"nan": pd.NA, "None": pd.NA})
+    s = s.str.replace(r"\s+", " ", regex=True)
+    return s
+
+def norm_key(s: str) -> str:
+    if s is None or (isinstance(s, float) and pd.isna(s)):
+        return ""
+    s = str(s).lower().strip().replace("&","and")
+    s = re.sub(r"[^a-z ]", "", s)
+    s = re.sub(r"\s+", " ", s)
+    return s
+
+def parse_mw(val):
+    if pd.isna(val):
+        return pd.NA
+    if isinstance(val, (int, float)):
+        return float(val)
+    s = str(val)
+    s = re.sub(r"[^\d.]", "", s.replace(",", ""))
+    try:
+        return float(s) if s else pd.NA
+    except Exception:
+        return pd.NA
+
+
+# ── milestones (Sheet1) ──────────────────────────────────────────────────────
+def read_milestones(file_path: str) -> pd.DataFrame:
+    df = pd.read_excel(file_path, sheet_name="Sheet1")
+    df = df.rename(columns={"Step No": "Step_No", "Checkpoints": "Checkpoint", "Milestones": "Milestone"})
+    df = df.dropna(how="all")
+    for c in ["Checkpoint", "Milestone"]:
+        df[c] = df[c].astype(str).str.strip()
+    df["Checkpoint"] = df["Checkpoint"].replace({"nan": pd.NA}).ffill()
+    if "Step_No" in df.columns:
+        df = df.sort_values("Step_No")
+    return df.reset_index(drop=True)
+
+def milestone_structure(milestones_df: pd.DataFrame):
+    """(CHECKPOINT_ORDER, CP_TO_MS, MS_TO_CP) from the milestones sheet."""
+    if milestones_df.empty:
+        return [], {}, {}
+    cp_order_df = (milestones_df[["Step_No","Checkpoint"]]
+                   .dropna(subset=["Checkpoint"])
+                   .drop_duplicates(subset=["Checkpoint"], keep="first"))
+    checkpoint_order = (cp_order_df.sort_values("Step_No")["Checkpoint"].tolist()
+                        if "Step_No" in cp_order_df.columns else cp_order_df["Checkpoint"].tolist())
+    # Clean milestone lists
+    cp_to_ms = {}
+    for cp in checkpoint_order:
+        ms = milestones_df.loc[milestones_df["Checkpoint"] == cp, "Milestone"].astype(str).str.strip().tolist()
+        ms = [m for m in ms if m and m.lower() != "nan"]
+        cp_to_ms[cp] = ms
+    ms_to_cp = {m: cp for cp, ms in cp_to_ms.items() for m in ms}
+    return checkpoint_order, cp_to_ms, ms_to_cp
+
+
+# ── under-construction Excel — ONLY Sheet 3 ──────────────────────────────────
+def find_uc_file(root="."):
+    for cand in UC_FILE_CANDIDATES:
+        if (Path(root) / cand).exists():
+            return str(Path(root) / cand)
+    return None
+
+def find_previous_uc_file(current: str, root="."):
+    # Latest report whose "as_on_<Month>_<Year>" is strictly before the current one
+    cur_date = report_date(current)
+    cands = list(Path(root).glob("Quarterly_Report_on_Under_Construction*.xlsx"))
+    if (Path(root) / REPORTS_DIR).is_dir():
+        cands += list((Path(root) / REPORTS_DIR).glob("*.xlsx"))
+    dated = [(report_date(p), str(p)) for p in cands]
+    dated = [(d, p) for d, p in dated if d and cur_date and d < cur_date]
+    return max(dated)[1] if dated else None
+
+def read_uc_ucprojects_sheet(path: str):
+    xl = pd.ExcelFile(path)
+    wanted = None
+    for nm in xl.sheet_names:
+      if str(nm).strip().lower() == "under construction projects":
+        wanted = nm
+        break
+    if wanted is None:
+        raise ValueError("The workbook does not contain a sheet named 'Under Construction Projects'.")
+    df = xl.parse(wanted)
+    df.rename(columns=lambda x: str(x).strip().replace("\\n"," ").replace("  "," "), inplace=True)
+    return df
+
+def normalize_project_type(v: str) -> str:
+    t = norm_key(v)
+    if any(k in t for k in ["hybrid","mix"]): return "Hybrid"
+    if any(k in t for k in ["wind"]):   return "Wind"
+    if any(k in t for k in ["solar","pv"]): return "Solar"
+    if any(k in t for k in ["hydro","hydel","psp","pumped"]): return "Hydro/PSP"
+    if any(k in t for k in ["battery","storage","bess"]): return "Storage"
+    return "Other"
+
+CPSU_TOKENS = [
+    "ntpc","nhpc","seci","nlc","sgel","sjvn","gail","iocl","ongc","bhel",
+    "pfc","rec","railway","railways","indian oil","powergrid","pgcil","sail","coal india","cil"
+]
+
+def classify_owner(developer: str) -> str:
+    # Whole-word match on the developer key, so "rec"/"sail" don't fire inside other words
+    s = f" {developer_key(developer)} "
+    return "CPSU" if any(f" {tok} " in s for tok in CPSU_TOKENS) else "Private"
+
+def registered_alias_map(root="."):
+    """alias_map for read_uc_clean backed by the developer id registry under `root`."""
+    return lambda developers: resolve_developers_registered(developers, Path(root) / DEVELOPER_IDS_FILE)
+
+def read_uc_clean(path: str, alias_map=None) -> pd.DataFrame:
+    """
+    Normalized project table. `alias_map(developers)` returns the
+    Developer → Developer_Canonical / Developer_ID frame (the app passes a cached
+    one; default: registered_alias_map()).
+    """
+    alias_map = alias_map or registered_alias_map()
+    raw = read_uc_ucprojects_sheet(path)
+
+    cols = [str(c) for c in raw.columns]
+    c_serial  = pickcol(cols, "S. No", "S No", "Sr. No", "Sl No", "Serial", "Sl. No.")
+    c_project = pickcol(cols, "Project Name","Project","Name")
+    c_state   = pickcol(cols, "State", "State/UT", "Location State")
+    c_loc     = pickcol(cols, "Project Location", "Location")
+    c_dev     = pickcol(cols, "Developer","Implementing Agency","Agency","Owner","Developer Name")
+    c_type    = pickcol(cols, "Project Type","Type","Technology","Mode")
+    c_cap     = pickcol(cols, "Capacity (MW)","Capacity MW","Capacity in MW","Capacity")
+    c_cod     = pickcol(cols, "COD","Expected COD","Date of Commissioning","Start Date","Date")
+
+    df = pd.DataFrame()
+    df["Serial"]       = pd.to_numeric(raw[c_serial], errors="coerce") if c_serial else pd.NA
+    df["Project_Name"] = norm_text_series(raw[c_project]) if c_project else pd.NA
+    df["State"]        = norm_text_series(raw[c_state])   if c_state   else pd.NA
+    df["Location"]     = norm_text_series(raw[c_loc])     if c_loc     else pd.NA
+    df["Developer"]    = norm_text_series(raw[c_dev])     if c_dev     else pd.NA
+    df["Project_Type"] = norm_text_series(raw[c_type])    if c_type    else pd.NA
+    df["Capacity_MW"]  = raw[c_cap].apply(parse_mw) if c_cap else pd.NA
+    df["Date"]         = pd.to_datetime(raw[c_cod], errors="coerce") if c_cod else pd.NaT
+
+    mask_total = (df["Project_Name"].str.contains("total", case=False, na=False)) | \
+                 (df["State"].str.contains("total", case=False, na=False))
+    df = df[~mask_total]
+    df = df.dropna(how="all", subset=["Project_Name","State","Capacity_MW"])
+
+    df["Project_Type"] = df["Project_Type"].fillna("").apply(normalize_project_type)
+    df["Developer_norm"] = (df["Developer"].fillna("")
+                            .str.lower().str.strip().str.replace(r"\s+"," ", regex=True))
+
+    dev_map = alias_map(df["Developer"])
+    df = df.merge(dev_map[["Developer","Developer_Canonical","Developer_ID"]], on="Developer", how="left")
+    df["Developer_Canonical"] = df["Developer_Canonical"].fillna(df["Developer"])
+    owner = {c: classify_owner(c) for c in df["Developer_Canonical"].dropna().unique()}
+    df["Owner_Class"]  = df["Developer_Canonical"].map(owner).fillna("Private")
+    # canonical state (State column, else parsed out of the location) — part of Project_ID
+    df["State_Name"]   = resolve_state_names(df["State"].fillna(df["Location"]), norm_key)
+    df["Project_ID"]   = assign_project_ids(df)
+    df["Project_Row"] = 1
+    return df.reset_index(drop=True)
+
+
+# ── checkpoints/milestones — event log, else random placeholder ─────────────
+def read_milestone_state(ms_to_cp: dict, root=".") -> pd.DataFrame:
+    return sync_milestone_events(Path(root) / EVENTS_DIR, ms_to_cp=ms_to_cp)
+
+def events_version(root=".") -> str:
+    return dataset_version(*event_drop_files(Path(root) / EVENTS_DIR))
+
+def assign_random_process(df_uc: pd.DataFrame, checkpoints: list[str], cp_to_ms: dict):
+    if df_uc.empty or not checkpoints:
+        return df_uc
+    rng = random.Random(42)
+    ms_choices = {cp: ([m for m in ms if str(m).strip()] or ["General"]) for cp, ms in cp_to_ms.items()}
+    for cp in checkpoints:
+        ms_choices.setdefault(cp, ["General"])
+    start_window = datetime.now() - timedelta(days=730)
+    span = max(1, (datetime.now() - start_window).days)
+
+    cps, mss, dates = [], [], []
+    for _ in range(len(df_uc)):
+        cp = rng.choice(checkpoints)
+        ms = rng.choice(ms_choices[cp])
+        d  = start_window + timedelta(days=rng.randint(0, span))
+        cps.append(cp); mss.append(ms); dates.append(d.date())
+
+    out = df_uc.copy()
+    out["Checkpoint"] = pd.Series(cps).fillna("Unassigned")
+    out["Milestone"]  = pd.Series(mss).fillna("Unassigned")
+    out["Milestone_Start_Date"] = dates
+    return out
+
+def assign_process(uc_df: pd.DataFrame, milestone_state: pd.DataFrame,
+                   checkpoint_order: list[str], cp_to_ms: dict) -> pd.DataFrame:
+    """uc_df + Checkpoint / Milestone / Milestone_Start_Date ("Unassigned"-filled)."""
+    if not milestone_state.empty and not uc_df.empty:
+        assigned_df = join_current_state(uc_df, milestone_state)
+    else:
+        assigned_df = assign_random_process(uc_df, checkpoint_order, cp_to_ms)
+    if not assigned_df.empty:
+        assigned_df["Checkpoint"] = assigned_df["Checkpoint"].astype(str).replace({"nan":"Unassigned"}).fillna("Unassigned")
+        assigned_df["Milestone"]  = assigned_df["Milestone"].astype(str).replace({"nan":"Unassigned"}).fillna("Unassigned")
+    return assigned_df
+
+def assigned_version(miles_file, uc_file, events_ver: str, from_events: bool) -> str:
+    # Cache key for anything derived from assigned_df (the random start-date window moves daily)
+    base = dataset_version(miles_file, uc_file)
+    return f"{base}:{events_ver}" if from_events else f"{base}:{datetime.now().date().isoformat()}"
+
+def load_dashboard(root=".") -> dict:
+    """
+    One uncached load of everything the dashboard shows, for the headless tools:
+    {"df" (assigned project table), "version", "from_events", "events_version",
+     "checkpoint_order", "cp_to_ms", "uc_file"}.
+    """
+    root = Path(root)
+    miles = root / MILES_FILE
+    uc_file = find_uc_file(root)
+    milestones_df = read_milestones(miles) if miles.exists() else pd.DataFrame()
+    checkpoint_order, cp_to_ms, ms_to_cp = milestone_structure(milestones_df)
+    uc_df = read_uc_clean(uc_file, alias_map=registered_alias_map(root)) if uc_file else pd.DataFrame()
+    ev_version = events_version(root)
+    state = read_milestone_state(ms_to_cp, root=root)
+    return {
+        "df": assign_process(uc_df, state, checkpoint_order, cp_to_ms),
+        "version": assigned_version(miles, uc_file, ev_version, not state.empty),
+        "from_events": not state.empty,
+        "events_version": ev_version,
+        "checkpoint_order": checkpoint_order,
+        "cp_to_ms": cp_to_ms,
+        "uc_file": uc_file,
+    }
@@ -0,0 +1,216 @@
+# src/milestone_events.py
+# Milestone-transition events → compacted current-state table.
+#
+# Layout under EVENTS_DIR:
+#   drops/               CSV / Excel files dropped by the field teams
+#                        (Project ID, Checkpoint, Milestone, Timestamp)
+#   event_log.csv        append-only log of every ingested event (+ Seq, Source)
+#   current_state.csv    one row per project: its latest checkpoint/milestone
+#   manifest.json        drops already ingested (fingerprint, rows read, hash of
+#                        those rows) + next sequence number
+#   .sync.lock           held while a sync runs (app, api_server and
+#                        build_reports may sync the same folder at once)
+#
+# sync_milestone_events() ingests only drops not yet in the manifest and folds
+# their events into the persisted state (latest Event_Time wins, ties → later
+# Seq), so a load never replays the full event history. A drop that grows under
+# the same name (a team appending rows) contributes only its new tail; a drop
+# whose already-ingested rows were edited or removed is rejected — re-drop the
+# corrections under a new name.
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from src.projects import is_project_id
+from src.utils.filelock import file_lock
+
+EVENT_COLUMNS = ["Project_ID", "Checkpoint", "Milestone", "Event_Time"]
+LOG_COLUMNS = ["Seq", *EVENT_COLUMNS, "Source"]
+STATE_COLUMNS = ["Project_ID", "Checkpoint", "Milestone", "Milestone_Start_Date", "Events", "Last_Seq"]
+DROP_SUFFIXES = (".csv", ".xlsx", ".xls")
+
+_COLUMN_ALIASES = {
+    "Project_ID": ["projectid", "project", "projid", "id"],
+    "Checkpoint": ["checkpoint", "checkpoints", "stage"],
+    "Milestone": ["milestone", "milestones", "step"],
+    "Event_Time": ["eventtime", "timestamp", "time", "date", "eventdate", "milestonestartdate", "startdate"],
+}
+
+def _paths(root):
+    root = Path(root)
+    return {
+        "drops": root / "drops",
+        "log": root / "event_log.csv",
+        "state": root / "current_state.csv",
+        "manifest": root / "manifest.json",
+        "lock": root / ".sync.lock",
+    }
+
+
+def event_drop_files(root) -> list[Path]:
+    drops = _paths(root)["drops"]
+    if not drops.is_dir():
+        return []
+    return sorted(p for p in drops.iterdir() if p.is_file() and p.suffix.lower() in DROP_SUFFIXES)
+
+
+def _drop_fingerprint(p: Path) -> str:
+    st_ = p.stat()
+    return f"{p.name}|{st_.st_size}|{st_.st_mtime_ns}"
+
+
+def _read_drop_raw(path) -> pd.DataFrame:
+    # read as text so appending rows never changes how the earlier rows parse
+    path = Path(path)
+    return pd.read_csv(path, dtype=str) if path.suffix.lower() == ".csv" else pd.read_excel(path, dtype=str)
+
+
+def _rows_hash(raw: pd.DataFrame) -> str:
+    h = hashlib.sha1("|".join(map(str, raw.columns)).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(raw.fillna(""), index=False).values.tobytes())
+    return h.hexdigest()
+
+
+def read_event_drop(path, ms_to_cp: dict | None = None, raw: pd.DataFrame | None = None) -> pd.DataFrame:
+    """Normalize one drop file (or its already-read `raw` rows) to EVENT_COLUMNS; rows without id/milestone/time are skipped."""
+    if raw is None:
+        raw = _read_drop_raw(path)
+    flat = {"".join(ch for ch in str(c).lower() if ch.isalnum()): c for c in raw.columns}
+    ev = pd.DataFrame(index=raw.index)
+    for col, aliases in _COLUMN_ALIASES.items():
+        src = next((flat[a] for a in aliases if a in flat), None)
+        ev[col] = raw[src] if src is not None else pd.NA
+
+    for c in ["Project_ID", "Checkpoint", "Milestone"]:
+        s = ev[c]
+        ev[c] = s.where(s.isna(), s.astype(str).str.strip()).replace({"nan": pd.NA, "None": pd.NA, "": pd.NA})
+    ev["Project_ID"] = ev["Project_ID"].str.upper()
+    if ms_to_cp:
+        ev["Checkpoint"] = ev["Checkpoint"].fillna(ev["Milestone"].map(ms_to_cp))
+    ev["Event_Time"] = pd.to_datetime(ev["Event_Time"], errors="coerce")
+
+    ok = ev["Project_ID"].map(is_project_id) & ev["Milestone"].notna() & ev["Event_Time"].notna()
+    return ev.loc[ok, EVENT_COLUMNS].reset_index(drop=True)
+
+
+def compact_events(state: pd.DataFrame, events: pd.DataFrame) -> pd.DataFrame:
+    """
+    Fold `events` (EVENT_COLUMNS + Seq) into `state` (STATE_COLUMNS). Cost is
+    O(len(state) + len(events)) — the history behind `state` is never re-read.
+    """
+    if events.empty:
+        return state
+    counts = events.groupby("Project_ID").size()
+    latest = (events.sort_values(["Event_Time", "Seq"])
+                    .drop_duplicates("Project_ID", keep="last")
+                    .rename(columns={"Event_Time": "Milestone_Start_Date", "Seq": "Last_Seq"}))
+    latest["Events"] = 0
+    merged = (latest[STATE_COLUMNS] if state.empty
+              else pd.concat([state, latest[STATE_COLUMNS]], ignore_index=True))
+    total = merged.groupby("Project_ID")["Events"].sum().add(counts, fill_value=0).astype(int)
+    out = (merged.sort_values(["Milestone_Start_Date", "Last_Seq"])
+                 .drop_duplicates("Project_ID", keep="last"))
+    out["Events"] = out["Project_ID"].map(total)
+    return out[STATE_COLUMNS].sort_values("Project_ID").reset_index(drop=True)
+
+
+def load_current_state(root) -> pd.DataFrame:
+    p = _paths(root)["state"]
+    if not p.exists():
+        return pd.DataFrame(columns=STATE_COLUMNS)
+    df = pd.read_csv(p, parse_dates=["Milestone_Start_Date"])
+    return df[STATE_COLUMNS]
+
+
+def _load_manifest(p: Path) -> dict:
+    if p.exists():
+        try:
+            manifest = json.loads(p.read_text(encoding="utf-8"))
+            # older manifests stored only the fingerprint string per drop
+            manifest["ingested"] = {k: (v if isinstance(v, dict) else {"fingerprint": v})
+                                    for k, v in manifest.get("ingested", {}).items()}
+            return manifest
+        except Exception:
+            pass
+    return {"ingested": {}, "next_seq": 1}
+
+
+def _is_pending(p: Path, manifest: dict) -> bool:
+    seen = manifest["ingested"].get(p.name, {})
+    return _drop_fingerprint(p) not in (seen.get("fingerprint"), seen.get("rejected"))
+
+
+def _new_rows(p: Path, seen: dict | None) -> tuple[pd.DataFrame, dict]:
+    """Rows of drop `p` not ingested yet + its new manifest entry; raises if ingested rows changed."""
+    raw = _read_drop_raw(p)
+    start = 0
+    if seen:
+        start = seen.get("rows")
+        if start is None:
+            raise ValueError("changed after ingestion (no row count recorded) — drop new events under a new name")
+        if len(raw) < start or _rows_hash(raw.iloc[:start]) != seen.get("rows_hash"):
+            raise ValueError("already-ingested rows were edited or removed — drop corrections under a new name")
+    entry = {"fingerprint": _drop_fingerprint(p), "rows": len(raw), "rows_hash": _rows_hash(raw)}
+    return raw.iloc[start:], entry
+
+
+def _atomic_write(p: Path, text: str):
+    tmp = p.with_suffix(p.suffix + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, p)
+
+
+def sync_milestone_events(root, ms_to_cp: dict | None = None) -> pd.DataFrame:
+    """Ingest pending drops (if any) and return the current-state table."""
+    paths = _paths(root)
+    if not event_drop_files(root):
+        return load_current_state(root)      # nothing to ingest: don't create the folder for a lock
+    with file_lock(paths["lock"]):
+        manifest = _load_manifest(paths["manifest"])
+        pending = [p for p in event_drop_files(root) if _is_pending(p, manifest)]
+        state = load_current_state(root)
+        if not pending:
+            return state
+
+        seq = int(manifest.get("next_seq", 1))
+        batches = []
+        for p in pending:
+            try:
+                tail, entry = _new_rows(p, manifest["ingested"].get(p.name))
+                ev = read_event_drop(p, ms_to_cp, raw=tail)
+            except Exception as e:
+                print(f"EVENT_DROP_ERROR: {p.name}: {e}")
+                if p.name in manifest["ingested"]:     # don't re-read it until it changes again
+                    manifest["ingested"][p.name]["rejected"] = _drop_fingerprint(p)
+                continue
+            ev.insert(0, "Seq", range(seq, seq + len(ev)))
+            ev["Source"] = p.name
+            seq += len(ev)
+            batches.append(ev)
+            manifest["ingested"][p.name] = entry
+
+        new = pd.concat(batches, ignore_index=True) if batches else pd.DataFrame(columns=LOG_COLUMNS)
+        if not new.empty:
+            new[LOG_COLUMNS].to_csv(paths["log"], mode="a", index=False,
+                                    header=not paths["log"].exists(), date_format="%Y-%m-%dT%H:%M:%S")
+            state = compact_events(state, new)
+            _atomic_write(paths["state"], state.to_csv(index=False, date_format="%Y-%m-%dT%H:%M:%S"))
+        manifest["next_seq"] = seq
+        manifest["updated"] = datetime.now().isoformat(timespec="seconds")
+        _atomic_write(paths["manifest"], json.dumps(manifest, indent=2))
+        return state
+
+
+def join_current_state(projects: pd.DataFrame, state: pd.DataFrame) -> pd.DataFrame:
+    """Attach Checkpoint / Milestone / Milestone_Start_Date to the project table."""
+    out = projects.merge(state[["Project_ID", "Checkpoint", "Milestone", "Milestone_Start_Date"]],
+                         on="Project_ID", how="left")
+    out["Checkpoint"] = out["Checkpoint"].fillna("Unassigned")
+    out["Milestone"] = out["Milestone"].fillna("Unassigned")
+    out["Milestone_Start_Date"] = pd.to_datetime(out["Milestone_Start_Date"], errors="coerce").dt.date
+    return out
@@ -0,0 +1,68 @@
+# src/projects.py
+# Stable project identity across reloads and quarterly reports.
+#
+# Project_ID = hash(normalized name | developer id | canonical state). Rows that
+# share that key in one sheet get a suffix hashed from their own content
+# (location | capacity | type), and rows that are identical even there are
+# numbered "-2", "-3"… in content order — never in sheet order, so re-sorting
+# the sheet or dropping an unrelated row does not move anyone's id. Serial
+# numbers are deliberately not part of the id: they get renumbered every quarter.
+
+import hashlib
+import re
+
+import pandas as pd
+
+KEY_COLUMNS = ("Project_Name", "Developer_ID", "State_Name")
+CONTENT_COLUMNS = ("Location", "Capacity_MW", "Project_Type")
+TIEBREAK_COLUMNS = ("Date", "Developer", "Serial")
+
+
+def _norm(s: pd.Series) -> pd.Series:
+    return (s.astype(object).where(s.notna(), "").astype(str).str.lower()
+             .str.replace("&", " and ", regex=False)
+             .str.replace(r"[^a-z0-9]+", " ", regex=True)
+             .str.strip())
+
+
+def _joined(df: pd.DataFrame, columns) -> pd.Series:
+    parts = [_norm(df[c]) if c in df.columns else pd.Series("", index=df.index) for c in columns]
+    key = parts[0]
+    for p in parts[1:]:
+        key = key + "|" + p
+    return key
+
+
+def _hash(s: pd.Series, n: int) -> pd.Series:
+    return s.map(lambda k: hashlib.sha1(k.encode("utf-8")).hexdigest()[:n].upper())
+
+
+def project_keys(df: pd.DataFrame) -> pd.Series:
+    return _joined(df, KEY_COLUMNS)
+
+
+def assign_project_ids(df: pd.DataFrame) -> pd.Series:
+    key = project_keys(df)
+    ids = "PRJ-" + _hash(key, 10)
+    dup = key.duplicated(keep=False)
+    if not dup.any():
+        return ids
+
+    content = key[dup] + "#" + _joined(df[dup], CONTENT_COLUMNS)
+    ids[dup] = ids[dup] + "-" + _hash(content, 6)
+    # rows identical in key and content: number them in (content-sorted) tiebreak order
+    same = content[content.duplicated(keep=False)]
+    if not same.empty:
+        tie = _joined(df.loc[same.index], TIEBREAK_COLUMNS)
+        order = pd.DataFrame({"content": same, "tie": tie}).sort_values(["content", "tie"], kind="stable")
+        n = order.groupby("content").cumcount()
+        n = n[n > 0]
+        ids[n.index] = ids[n.index] + "-" + (n + 1).astype(str)
+    return ids
+
+
+_ID_RE = re.compile(r"^PRJ-[0-9A-F]{10}(-[0-9A-F]{6})?(-\d+)?$")
+
+
+def is_project_id(s) -> bool:
+    return bool(_ID_RE.match(str(s or "").strip().upper()))
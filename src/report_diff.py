@@ -0,0 +1,143 @@
+# src/report_diff.py
+# Added / removed / changed projects between two quarterly reports.
+#
+# Both sides are the normalized output of load_uc_clean. Each row gets a 64-bit
+# hash of its COMPARE_COLUMNS; projects are matched with hash joins (linear
+# time), so only matched pairs whose hashes differ are inspected field by field.
+#
+# Matching passes, each on a stable key (never on sheet position):
+#   1) normalized name | developer id | state   (project_keys — Project_ID without
+#                                                its duplicate suffix)
+#   2) name + state       leftovers whose developer was renamed / re-entered
+# Inside a key group rows pair up by content hash first (identical rows are
+# interchangeable), then by location | capacity | type, and only a single
+# remaining row per side is treated as the same project "changed". Anything
+# still ambiguous is reported as removed / added rather than guessed.
+# Serial numbers are not used for matching — they are renumbered every quarter.
+
+import re
+from datetime import datetime
+
+import pandas as pd
+
+from src.projects import CONTENT_COLUMNS, project_keys
+
+COMPARE_COLUMNS = ["Capacity_MW", "Date", "Project_Type", "Developer_Canonical", "State_Name", "Location"]
+SHOW_COLUMNS = ["Project_ID", "Project_Name", "Developer", "State_Name", "Project_Type", "Capacity_MW", "Date"]
+
+_AS_ON = re.compile(r"as[_ ]on[_ ]([A-Za-z]+)[_ ](\d{4})", re.IGNORECASE)
+
+
+def report_date(path) -> datetime | None:
+    """Quarter end encoded in a report file name ('..._as_on_June_2025.xlsx')."""
+    m = _AS_ON.search(str(path))
+    if not m:
+        return None
+    for fmt in ("%B %Y", "%b %Y"):
+        try:
+            return datetime.strptime(f"{m.group(1)} {m.group(2)}", fmt)
+        except ValueError:
+            pass
+    return None
+
+
+def row_hashes(df: pd.DataFrame, columns=COMPARE_COLUMNS) -> pd.Series:
+    cols = [c for c in columns if c in df.columns]
+    norm = df[cols].copy()
+    if "Capacity_MW" in norm.columns:
+        norm["Capacity_MW"] = pd.to_numeric(norm["Capacity_MW"], errors="coerce").round(3)
+    if "Date" in norm.columns:
+        norm["Date"] = pd.to_datetime(norm["Date"], errors="coerce").dt.normalize()
+    return pd.util.hash_pandas_object(norm.astype(str), index=False)
+
+
+def _name_state_key(df: pd.DataFrame) -> pd.Series:
+    parts = [df[c].fillna("").astype(str).str.lower().str.replace(r"[^a-z0-9]+", " ", regex=True).str.strip()
+             for c in ("Project_Name", "State_Name") if c in df.columns]
+    key = parts[0]
+    for p in parts[1:]:
+        key = key + "|" + p
+    return key
+
+
+def _pair(a: pd.DataFrame, b: pd.DataFrame, on: list, interchangeable: bool) -> pd.DataFrame:
+    """
+    (old_pos, new_pos) pairs joining `a` and `b` on `on`. Interchangeable rows
+    (same content hash) pair up as multisets; otherwise only keys unique on both
+    sides pair.
+    """
+    if interchangeable:
+        a = a.assign(_n=a.groupby(on).cumcount())
+        b = b.assign(_n=b.groupby(on).cumcount())
+        return a.merge(b, on=[*on, "_n"], how="inner")[["old_pos", "new_pos"]]
+    a = a.drop_duplicates(on, keep=False)
+    b = b.drop_duplicates(on, keep=False)
+    return a.merge(b, on=on, how="inner")[["old_pos", "new_pos"]]
+
+
+def _match(old: pd.DataFrame, new: pd.DataFrame, key_old: pd.Series, key_new: pd.Series) -> pd.DataFrame:
+    """(old_pos, new_pos) pairs within each key group: same hash, then same content, then 1:1 leftovers."""
+    a = pd.DataFrame({"key": key_old.to_numpy(), "hash": old["_hash"].to_numpy(),
+                      "content": old["_content"].to_numpy(), "old_pos": old["_pos"].to_numpy()})
+    b = pd.DataFrame({"key": key_new.to_numpy(), "hash": new["_hash"].to_numpy(),
+                      "content": new["_content"].to_numpy(), "new_pos": new["_pos"].to_numpy()})
+    a, b = a[a["key"] != ""], b[b["key"] != ""]
+    found = []
+    for on, interchangeable in ((["key", "hash"], True), (["key", "content"], False), (["key"], False)):
+        pairs = _pair(a, b, on, interchangeable)
+        found.append(pairs)
+        a = a[~a["old_pos"].isin(pairs["old_pos"])]
+        b = b[~b["new_pos"].isin(pairs["new_pos"])]
+    return pd.concat(found, ignore_index=True)
+
+
+def diff_reports(old: pd.DataFrame, new: pd.DataFrame) -> dict:
+    """
+    Returns {"added", "removed", "changed": DataFrames, "unchanged": int}.
+    `changed` has <col>_old / <col>_new for COMPARE_COLUMNS plus Capacity_Delta_MW,
+    COD_Shift_Days and a Changed_Fields summary.
+    """
+    old = old.reset_index(drop=True).assign(_pos=lambda d: range(len(d)))
+    new = new.reset_index(drop=True).assign(_pos=lambda d: range(len(d)))
+    h_old, h_new = row_hashes(old).to_numpy(), row_hashes(new).to_numpy()
+    old["_hash"], new["_hash"] = h_old, h_new
+    old["_content"], new["_content"] = row_hashes(old, CONTENT_COLUMNS), row_hashes(new, CONTENT_COLUMNS)
+
+    pairs = _match(old, new, project_keys(old), project_keys(new))
+    left_old = old[~old["_pos"].isin(pairs["old_pos"])]
+    left_new = new[~new["_pos"].isin(pairs["new_pos"])]
+    pairs2 = _match(left_old, left_new, _name_state_key(left_old), _name_state_key(left_new))
+    pairs = pd.concat([pairs, pairs2], ignore_index=True)
+
+    removed = old[~old["_pos"].isin(pairs["old_pos"])]
+    added = new[~new["_pos"].isin(pairs["new_pos"])]
+
+    differs = h_old[pairs["old_pos"].to_numpy()] != h_new[pairs["new_pos"].to_numpy()]
+    ch = pairs[differs]
+    cols = [c for c in COMPARE_COLUMNS if c in old.columns and c in new.columns]
+    o = old.iloc[ch["old_pos"].to_numpy()].reset_index(drop=True)
+    n = new.iloc[ch["new_pos"].to_numpy()].reset_index(drop=True)
+    changed = pd.DataFrame({
+        "Project_ID": n["Project_ID"],
+        "Project_ID_old": o["Project_ID"],
+        "Project_Name": n["Project_Name"],
+        "Developer": n["Developer"],
+    })
+    fields = pd.Series("", index=changed.index)
+    for c in cols:
+        changed[f"{c}_old"], changed[f"{c}_new"] = o[c], n[c]
+        a, b = row_hashes(o, [c]), row_hashes(n, [c])
+        fields = fields.where(a == b, fields + ", " + c)
+    changed["Changed_Fields"] = fields.str.lstrip(", ")
+    changed["Capacity_Delta_MW"] = (pd.to_numeric(n["Capacity_MW"], errors="coerce")
+                                    - pd.to_numeric(o["Capacity_MW"], errors="coerce"))
+    changed["COD_Shift_Days"] = (pd.to_datetime(n["Date"], errors="coerce")
+                                 - pd.to_datetime(o["Date"], errors="coerce")).dt.days.astype("Int64")
+
+    show = [c for c in SHOW_COLUMNS if c in new.columns]
+    return {
+        "added": added[show].reset_index(drop=True),
+        "removed": removed[[c for c in SHOW_COLUMNS if c in old.columns]].reset_index(drop=True),
+        "changed": changed,
+        "unchanged": int((~differs).sum()),
+    }
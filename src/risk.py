@@ -0,0 +1,75 @@
+# src/risk.py
+# Schedule-risk analytics over the full project table (vectorized, no row loops).
+#
+# Per project:
+#   Days_In_Milestone  today − Milestone_Start_Date
+#   Days_To_COD        expected COD (Date) − today
+#   Checkpoint_Pos     1-based position of Checkpoint in CHECKPOINT_ORDER (0 = unknown)
+#   Risk_Reason        first rule that fires:
+#       "No progress data" checkpoint unknown ("Unassigned") — nothing to judge, not at risk
+#       "COD passed"       COD already behind us and the last checkpoint not reached
+#       "Behind schedule"  fewer days to COD than remaining checkpoints × DAYS_PER_CHECKPOINT
+#                          (never at the last checkpoint: nothing remains)
+#       "Stalled"          stuck in the current milestone longer than STALL_DAYS
+#   At_Risk            Risk_Reason in RISK_REASONS
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+DAYS_PER_CHECKPOINT = 90
+STALL_DAYS = 180
+NO_PROGRESS = "No progress data"
+RISK_REASONS = ("COD passed", "Behind schedule", "Stalled")
+RISK_GROUPS = {"State": "State_Name", "Developer": "Developer_Canonical", "Project type": "Project_Type"}
+
+
+def compute_schedule_risk(df: pd.DataFrame, checkpoint_order: list, today: date | None = None) -> pd.DataFrame:
+    """Risk columns for every row of `df` (same index)."""
+    today = pd.Timestamp(today or date.today())
+    n_cp = len(checkpoint_order)
+
+    start = pd.to_datetime(df["Milestone_Start_Date"], errors="coerce")
+    cod = pd.to_datetime(df["Date"], errors="coerce")
+    pos = (df["Checkpoint"].map({cp: i for i, cp in enumerate(checkpoint_order, start=1)})
+                           .fillna(0).astype(int))
+
+    days_in = (today - start).dt.days
+    days_to = (cod - today).dt.days
+    known = pos > 0
+    remaining = n_cp - pos
+
+    cod_passed = known & (days_to < 0) & (remaining > 0)
+    behind = known & days_to.notna() & (remaining > 0) & (days_to < remaining * DAYS_PER_CHECKPOINT)
+    stalled = known & (days_in > STALL_DAYS)
+    reason = np.select([~known.to_numpy(), cod_passed.to_numpy(), behind.to_numpy(), stalled.to_numpy()],
+                       [NO_PROGRESS, *RISK_REASONS], default="")
+
+    return pd.DataFrame({
+        "Days_In_Milestone": days_in.astype("Int64"),
+        "Days_To_COD": days_to.astype("Int64"),
+        "Checkpoint_Pos": pos,
+        "Risk_Reason": reason,
+        "At_Risk": np.isin(reason, RISK_REASONS),
+    }, index=df.index)
+
+
+def aggregate_risk(df: pd.DataFrame, risk: pd.DataFrame, by: str) -> pd.DataFrame:
+    """Projects / at-risk counts, at-risk MW and median day counts per `by` column."""
+    cap = pd.to_numeric(df["Capacity_MW"], errors="coerce").fillna(0.0)
+    frame = pd.DataFrame({
+        by: df[by].fillna("Unknown"),
+        "Projects": 1,
+        "At_Risk": risk["At_Risk"].astype(int),
+        "At_Risk_MW": cap.where(risk["At_Risk"], 0.0),
+        "Days_To_COD": risk["Days_To_COD"].astype("float"),
+        "Days_In_Milestone": risk["Days_In_Milestone"].astype("float"),
+    })
+    out = (frame.groupby(by, as_index=False)
+                .agg(Projects=("Projects", "sum"), At_Risk=("At_Risk", "sum"),
+                     At_Risk_MW=("At_Risk_MW", "sum"),
+                     Median_Days_To_COD=("Days_To_COD", "median"),
+                     Median_Days_In_Milestone=("Days_In_Milestone", "median")))
+    out["At_Risk_Share"] = (out["At_Risk"] / out["Projects"]).round(3)
+    return out.sort_values(["At_Risk", "At_Risk_MW"], ascending=False).reset_index(drop=True)
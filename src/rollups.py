@@ -0,0 +1,87 @@
+# src/rollups.py
+# Precomputed time rollups for the "Projects over time" view.
+#
+# build_time_rollups() parses the date columns once and aggregates projects and
+# capacity into a small cube:
+#     Basis × Granularity × Period × (Project_Type, Checkpoint, Milestone)
+# query_rollup() then answers any granularity/filter combination from the cube
+# alone, so switching views never goes back to the project rows.
+
+import pandas as pd
+
+GRANULARITIES = ["Week", "Month", "Quarter", "Financial year"]
+DATE_BASES = {"COD": "Date", "Milestone start": "Milestone_Start_Date"}
+ROLLUP_DIMS = ("Project_Type", "Checkpoint", "Milestone")
+
+
+def period_start(dates: pd.Series, granularity: str) -> pd.Series:
+    """Start timestamp of the period each date falls in (Indian FY runs April–March)."""
+    if granularity == "Week":
+        return dates.dt.to_period("W-SUN").dt.start_time
+    if granularity == "Month":
+        return dates.dt.to_period("M").dt.to_timestamp()
+    if granularity == "Quarter":
+        return dates.dt.to_period("Q").dt.to_timestamp()
+    if granularity == "Financial year":
+        fy = dates.dt.year - (dates.dt.month < 4).astype(int)
+        return pd.to_datetime({"year": fy, "month": 4, "day": 1}, errors="coerce")
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+
+def period_label(start: pd.Series, granularity: str) -> pd.Series:
+    if granularity == "Financial year":
+        y = start.dt.year
+        return "FY" + y.astype(str) + "-" + ((y + 1) % 100).astype(str).str.zfill(2)
+    if granularity == "Quarter":
+        return start.dt.to_period("Q").astype(str)
+    if granularity == "Month":
+        return start.dt.strftime("%b %Y")
+    return "Wk of " + start.dt.strftime("%d %b %Y")
+
+
+def build_time_rollups(df: pd.DataFrame, dims=ROLLUP_DIMS) -> pd.DataFrame:
+    """
+    Long-format cube with columns:
+    Basis, Granularity, Period, <dims...>, Projects, Capacity_MW.
+    """
+    dims = [d for d in dims if d in df.columns]
+    cols = ["Basis", "Granularity", "Period", *dims, "Projects", "Capacity_MW"]
+    if df.empty:
+        return pd.DataFrame(columns=cols)
+
+    base = df[dims].copy()
+    base["Projects"] = df["Project_Row"] if "Project_Row" in df.columns else 1
+    base["Capacity_MW"] = (pd.to_numeric(df["Capacity_MW"], errors="coerce").fillna(0.0)
+                           if "Capacity_MW" in df.columns else 0.0)
+
+    parts = []
+    for basis, col in DATE_BASES.items():
+        if col not in df.columns:
+            continue
+        dates = pd.to_datetime(df[col], errors="coerce")
+        ok = dates.notna()
+        if not ok.any():
+            continue
+        b, d = base[ok], dates[ok]
+        for gran in GRANULARITIES:
+            agg = (b.assign(Period=period_start(d, gran))
+                     .groupby(["Period", *dims], as_index=False, observed=True, dropna=False)
+                     [["Projects", "Capacity_MW"]].sum())
+            agg.insert(0, "Granularity", gran)
+            agg.insert(0, "Basis", basis)
+            parts.append(agg)
+    if not parts:
+        return pd.DataFrame(columns=cols)
+    return pd.concat(parts, ignore_index=True)[cols]
+
+
+def query_rollup(rollups: pd.DataFrame, basis: str, granularity: str, filters: dict | None = None) -> pd.DataFrame:
+    """Series for one basis/granularity, summed over the cube rows matching `filters` (dim → value)."""
+    cube = rollups[(rollups["Basis"] == basis) & (rollups["Granularity"] == granularity)]
+    for dim, val in (filters or {}).items():
+        if val is not None and dim in cube.columns:
+            cube = cube[cube[dim] == val]
+    out = (cube.groupby("Period", as_index=False)[["Projects", "Capacity_MW"]].sum()
+               .sort_values("Period"))
+    out["Label"] = period_label(out["Period"], granularity) if not out.empty else pd.Series(dtype=str)
+    return out.reset_index(drop=True)
@@ -0,0 +1,163 @@
+# src/search_index.py
+# Prefix + substring search over Project_Name / Developer / State / location.
+#
+# Layout (built once per dataset version):
+#   vocab     sorted array of distinct normalized tokens
+#   postings  CSR-style: rows[offsets[t]:offsets[t+1]] = row positions containing token t
+#   trigrams  trigram -> token ids (over the vocabulary, not the rows)
+#
+# A query term matches a token by prefix (bisect on the sorted vocab) or, for
+# terms of 3+ chars, by substring (trigram candidates, then verified). Terms are
+# ANDed. Everything per-query touches only the vocabulary and posting arrays,
+# never the DataFrame, so lookups stay in the millisecond range at 1M rows.
+
+import bisect
+import re
+
+import numpy as np
+import pandas as pd
+
+# State is empty in most quarterly sheets; State_Name (canonical, resolved from
+# State or Location) and the raw Location carry the state / district text
+SEARCH_FIELDS = ("Project_Name", "Developer", "State", "State_Name", "Location")
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_query(s: str) -> list[str]:
+    s = str(s or "").lower().replace("&", " and ")
+    return [t for t in _NON_ALNUM.sub(" ", s).split() if t]
+
+
+def _trigrams(tok: str):
+    return {tok[i:i + 3] for i in range(len(tok) - 2)}
+
+
+class SearchIndex:
+    def __init__(self, vocab, rows, offsets, trigrams, rank_pos, n_rows):
+        self.vocab = vocab            # list[str], sorted
+        self.rows = rows              # np.int64 row positions grouped by token id
+        self.offsets = offsets        # np.int64, len(vocab) + 1
+        self.trigrams = trigrams      # dict[str, np.ndarray[token_id]]
+        self.rank_pos = rank_pos      # np.int64, rank of each row (0 = shown first)
+        self.n_rows = n_rows
+
+    def __len__(self):
+        return self.n_rows
+
+    # ── token lookup ─────────────────────────────────────────────────────────
+    def _prefix_tokens(self, term: str) -> np.ndarray:
+        lo = bisect.bisect_left(self.vocab, term)
+        hi = bisect.bisect_left(self.vocab, term + "\uffff")
+        return np.arange(lo, hi, dtype=np.int64)
+
+    def _substring_tokens(self, term: str) -> np.ndarray:
+        if len(term) < 3:
+            return np.empty(0, dtype=np.int64)
+        lists = []
+        for g in _trigrams(term):
+            ids = self.trigrams.get(g)
+            if ids is None:
+                return np.empty(0, dtype=np.int64)
+            lists.append(ids)
+        lists.sort(key=len)
+        cand = lists[0]
+        for ids in lists[1:]:
+            cand = np.intersect1d(cand, ids, assume_unique=True)
+            if not len(cand):
+                return cand
+        return np.array([t for t in cand if term in self.vocab[t]], dtype=np.int64)
+
+    def _mask_for_tokens(self, token_ids: np.ndarray) -> np.ndarray:
+        # Dense row bitmap: OR/AND over 1M rows is a ~1ms vector op, far cheaper
+        # than sorting/uniquing the concatenated posting lists of common tokens.
+        mask = np.zeros(self.n_rows, dtype=bool)
+        for t in token_ids:
+            mask[self.rows[self.offsets[t]:self.offsets[t + 1]]] = True
+        return mask
+
+    # ── public API ───────────────────────────────────────────────────────────
+    def search(self, query: str, limit: int | None = 50) -> np.ndarray:
+        """
+        Row positions matching every term of `query`. Rows where every term is a
+        token prefix come first, then substring-only matches; within each tier
+        rows follow the rank given at build time. `limit=None` returns all hits.
+        """
+        terms = normalize_query(query)
+        if not terms or not self.n_rows:
+            return np.empty(0, dtype=np.int64)
+
+        prefix_mask = np.ones(self.n_rows, dtype=bool)
+        all_mask = np.ones(self.n_rows, dtype=bool)
+        for term in terms:
+            p_tok = self._prefix_tokens(term)
+            s_tok = np.setdiff1d(self._substring_tokens(term), p_tok, assume_unique=True)
+            p_mask = self._mask_for_tokens(p_tok)
+            prefix_mask &= p_mask
+            if len(s_tok):
+                p_mask |= self._mask_for_tokens(s_tok)
+            all_mask &= p_mask
+            if not all_mask.any():
+                return np.empty(0, dtype=np.int64)
+
+        out, remaining = [], limit
+        for tier in (np.flatnonzero(prefix_mask), np.flatnonzero(all_mask & ~prefix_mask)):
+            if not len(tier) or remaining == 0:
+                continue
+            keys = self.rank_pos[tier]
+            if remaining is not None and len(tier) > remaining:
+                part = np.argpartition(keys, remaining - 1)[:remaining]
+                tier, keys = tier[part], keys[part]
+            out.append(tier[np.argsort(keys, kind="stable")])
+            if remaining is not None:
+                remaining -= len(out[-1])
+        return np.concatenate(out) if out else np.empty(0, dtype=np.int64)
+
+
+def build_search_index(df: pd.DataFrame, fields=SEARCH_FIELDS, rank_by: str = "Capacity_MW") -> SearchIndex:
+    """
+    Build the index over `df` (row positions, not index labels). Results are
+    ranked by `rank_by` descending (largest projects first) when present.
+    """
+    n = len(df)
+    pos = np.arange(n, dtype=np.int64)
+
+    frames = []
+    for f in fields:
+        if f not in df.columns:
+            continue
+        toks = (df[f].fillna("").astype(str).str.lower()
+                     .str.replace("&", " and ", regex=False)
+                     .str.replace(r"[^a-z0-9]+", " ", regex=True)
+                     .str.split())
+        toks.index = pos
+        frames.append(toks.explode().dropna())
+    if frames:
+        pairs = pd.concat(frames)
+        pairs = pairs[pairs != ""]
+        pairs = (pd.DataFrame({"row": pairs.index.to_numpy(dtype=np.int64), "tok": pairs.to_numpy()})
+                   .drop_duplicates())
+    else:
+        pairs = pd.DataFrame({"row": np.empty(0, dtype=np.int64), "tok": np.empty(0, dtype=object)})
+
+    codes, uniques = pd.factorize(pairs["tok"], sort=True)
+    vocab = [str(t) for t in uniques]
+    order = np.lexsort((pairs["row"].to_numpy(), codes))
+    rows = pairs["row"].to_numpy()[order].astype(np.int64)
+    offsets = np.searchsorted(codes[order], np.arange(len(vocab) + 1)).astype(np.int64)
+
+    tri = {}
+    for tid, tok in enumerate(vocab):
+        for g in _trigrams(tok):
+            tri.setdefault(g, []).append(tid)
+    trigrams = {g: np.asarray(ids, dtype=np.int64) for g, ids in tri.items()}
+
+    if rank_by in df.columns:
+        score = pd.to_numeric(df[rank_by], errors="coerce").fillna(-np.inf).to_numpy()
+        order_rows = np.argsort(-score, kind="stable")
+    else:
+        order_rows = pos
+    rank_pos = np.empty(n, dtype=np.int64)
+    rank_pos[order_rows] = pos
+
+    return SearchIndex(vocab, rows, offsets, trigrams, rank_pos, n)
@@ -0,0 +1,61 @@
+# src/table_pages.py
+# Server-side sorting/paging for the project table.
+#
+# Each sortable column is argsorted ONCE per dataset version. Sorting a
+# selection is then just filtering that global order by a row mask (O(n), no
+# re-sort), and only the rows of the visible page are ever materialized.
+
+import numpy as np
+import pandas as pd
+
+
+class SortIndex:
+    def __init__(self, orders: dict, n_rows: int):
+        self.orders = orders      # column -> (positions sorted asc with NaN last, n_valid)
+        self.n_rows = n_rows
+
+    @property
+    def columns(self):
+        return list(self.orders)
+
+    def ordered(self, rows: np.ndarray, column: str, descending: bool = False) -> np.ndarray:
+        """`rows` (positions) in sort order of `column`; missing values always last."""
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[rows] = True
+        order, n_valid = self.orders[column]
+        valid, missing = order[:n_valid], order[n_valid:]
+        if descending:
+            valid = valid[::-1]
+        return np.concatenate([valid[mask[valid]], missing[mask[missing]]])
+
+
+def build_sort_index(df: pd.DataFrame, columns) -> SortIndex:
+    orders = {}
+    for c in columns:
+        if c not in df.columns:
+            continue
+        s = df[c]
+        key = s
+        if s.dtype == object:
+            num = pd.to_numeric(s, errors="coerce")
+            if num.notna().sum() == s.notna().sum():
+                key = num          # e.g. Capacity_MW holds floats mixed with pd.NA
+            else:
+                # text/date objects: sort case-insensitively on the text form
+                key = s.where(s.isna(), s.astype(str).str.lower())
+        valid = key.notna().to_numpy()
+        pos = np.arange(len(df), dtype=np.int64)
+        v_pos = pos[valid]
+        v_ord = np.argsort(key.to_numpy()[valid], kind="stable")
+        orders[c] = (np.concatenate([v_pos[v_ord], pos[~valid]]), int(valid.sum()))
+    return SortIndex(orders, len(df))
+
+
+def page_count(n_rows: int, page_size: int) -> int:
+    return max(1, -(-n_rows // page_size))
+
+
+def page_slice(ordered_rows: np.ndarray, page: int, page_size: int) -> np.ndarray:
+    page = min(max(1, page), page_count(len(ordered_rows), page_size))
+    start = (page - 1) * page_size
+    return ordered_rows[start:start + page_size]
@@ -0,0 +1,60 @@
+# src/utils/filelock.py
+# Exclusive lock on a sidecar file, for files that the app and the headless
+# tools (api_server, build_reports) read–merge–write in place. A threading.Lock
+# only covers the Streamlit sessions of one process; this also blocks the other
+# processes. The OS drops the lock when its holder exits, so a crashed run
+# never leaves a stale lock behind.
+
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:      # Windows
+    fcntl = None
+    import msvcrt
+
+_THREAD_LOCKS: dict[str, threading.Lock] = {}
+_GUARD = threading.Lock()
+
+
+def _thread_lock(key: str) -> threading.Lock:
+    with _GUARD:
+        return _THREAD_LOCKS.setdefault(key, threading.Lock())
+
+
+def _acquire(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        return
+    while True:
+        try:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)   # gives up after ~10 s, so retry
+            return
+        except OSError:
+            continue
+
+
+def _release(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive lock on `path` (created if missing) across threads and processes."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _thread_lock(os.path.abspath(path)):
+        with open(path, "a+b") as f:
+            _acquire(f)
+            try:
+                yield
+            finally:
+                _release(f)
@@ -0,0 +1,25 @@
+# src/utils/versioning.py
+# Cheap dataset fingerprints used as cache keys: a workbook only gets re-parsed
+# (and its derived indexes rebuilt) when its bytes on disk actually change.
+
+import hashlib
+from pathlib import Path
+
+
+def dataset_version(*paths) -> str:
+    """
+    Short stable id for the given files based on name, size and mtime.
+    Missing files / None contribute a fixed marker so the id is still stable.
+    """
+    h = hashlib.sha1()
+    for p in paths:
+        if not p:
+            h.update(b"<none>")
+            continue
+        p = Path(p)
+        try:
+            st_ = p.stat()
+            h.update(f"{p.name}|{st_.st_size}|{st_.st_mtime_ns}".encode("utf-8"))
+        except OSError:
+            h.update(f"{p.name}|<missing>".encode("utf-8"))
+    return h.hexdigest()[:16]
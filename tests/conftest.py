@@ -0,0 +1,6 @@
+# tests/conftest.py
+# Make `src` importable when pytest is run from the project root or tests/.
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,74 @@
+# tests/test_api_server.py
+import importlib.util
+import json
+import threading
+import urllib.error
+import urllib.request
+from http import HTTPStatus
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+_spec = importlib.util.spec_from_file_location(
+    "api_server", Path(__file__).resolve().parent.parent / "tools" / "api_server.py")
+api_server = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(api_server)
+
+DF = pd.DataFrame({
+    "Project_ID": [f"PRJ-{i:010d}" for i in range(10)],
+    "Project_Name": [f"P{i}" for i in range(10)],
+    "Project_Type": ["Solar"] * 10,
+    "Capacity_MW": [10.0] * 10,
+    "Project_Row": 1,
+})
+
+
+class _Data:
+    quiet = True
+
+    def current(self):
+        return "v1", DF
+
+
+@pytest.fixture
+def base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), api_server.make_handler(_Data()))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _get(url, etag=None):
+    req = urllib.request.Request(url, headers={"If-None-Match": etag} if etag else {})
+    try:
+        with urllib.request.urlopen(req) as r:
+            return r.status, r.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+def test_negative_limit_is_rejected():
+    status, payload = api_server.route("/api/projects", {"limit": ["-5"]}, DF, "v1")
+    assert status == HTTPStatus.BAD_REQUEST
+    status, payload = api_server.route("/api/projects", {"limit": ["3"]}, DF, "v1")
+    assert status == HTTPStatus.OK and len(payload["rows"]) == 3
+
+
+def test_etag_applies_only_to_successful_routes(base_url):
+    assert _get(base_url + "/api/kpis", etag='"v1"')[0] == 304
+    assert _get(base_url + "/api/nonexistent", etag='"v1"')[0] == 404
+    assert _get(base_url + "/api/projects?limit=-5", etag='"v1"')[0] == 400
+    status, body = _get(base_url + "/api/kpis")
+    assert status == 200 and json.loads(body)["version"] == "v1"
+
+
+def test_not_modified_skips_building_the_payload(base_url, monkeypatch):
+    def fail(*args):
+        raise AssertionError("payload built for a 304")
+    monkeypatch.setattr(api_server, "build", fail)
+    assert _get(base_url + "/api/projects?sort=Capacity_MW&desc=1", etag='"v1"')[0] == 304
+    assert _get(base_url + "/api/projects?sort=Nope", etag='"v1"')[0] == 400
+    assert _get(base_url + "/api/aggregates/nope", etag='"v1"')[0] == 404
@@ -0,0 +1,46 @@
+# tests/test_developers.py
+import multiprocessing
+
+import pandas as pd
+
+from src.developers import load_developer_ids, resolve_developers, resolve_developers_registered
+
+
+def _ids(out):
+    return dict(zip(out["Developer"], out["Developer_ID"]))
+
+
+def test_aliases_share_one_id():
+    out = _ids(resolve_developers(pd.Series(["NTPC Ltd", "NTPC Limited", "N.T.P.C.", "Adani Green Energy Ltd"])))
+    assert out["NTPC Ltd"] == out["NTPC Limited"] == out["N.T.P.C."]
+    assert out["Adani Green Energy Ltd"] != out["NTPC Ltd"]
+
+
+def test_registered_id_survives_a_new_spelling(tmp_path):
+    reg = tmp_path / "developer_ids.csv"
+    before = _ids(resolve_developers_registered(pd.Series(["TP Surya Ltd"]), reg))
+    after = _ids(resolve_developers_registered(pd.Series(["TP Surya Ltd", "TP Saurya Limited"]), reg))
+    assert after["TP Saurya Limited"] == after["TP Surya Ltd"] == before["TP Surya Ltd"]
+    # both spellings are recorded, so the id also holds if the old one disappears
+    assert set(load_developer_ids(reg).values()) == {before["TP Surya Ltd"]}
+    only_new = _ids(resolve_developers_registered(pd.Series(["TP Saurya Limited"]), reg))
+    assert only_new["TP Saurya Limited"] == before["TP Surya Ltd"]
+
+
+def test_numbered_spvs_stay_separate():
+    out = _ids(resolve_developers(pd.Series(["Azure Power Forty One", "Azure Power Forty Two"])))
+    assert out["Azure Power Forty One"] != out["Azure Power Forty Two"]
+
+
+def test_concurrent_registrations_keep_every_key(tmp_path):
+    reg = tmp_path / "developer_ids.csv"
+    batches = [pd.Series([f"Alpha Solar {w} Ltd" for w in ("One", "Two", "Three")]),
+               pd.Series([f"Beta Wind {w} Ltd" for w in ("One", "Two", "Three")])]
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=resolve_developers_registered, args=(b, reg)) for b in batches]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(timeout=60)
+        assert p.exitcode == 0
+    assert len(load_developer_ids(reg)) == 6
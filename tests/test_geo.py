@@ -0,0 +1,53 @@
+# tests/test_geo.py
+import math
+
+from src.geo import simplify_states
+from src.loaders import norm_key
+
+
+def _circle(cx, cy, r, n=51):
+    ring = [[cx + r * math.cos(2 * math.pi * i / n), cy + r * math.sin(2 * math.pi * i / n)] for i in range(n)]
+    return ring + [ring[0]]            # GeoJSON rings are closed
+
+
+def _feature(name, ring, prop="st_nm"):
+    return {"type": "Feature", "properties": {prop: name},
+            "geometry": {"type": "Polygon", "coordinates": [ring]}}
+
+
+def test_closed_rings_survive_simplification():
+    geo = {"type": "FeatureCollection", "features": [
+        _feature("Rajasthan", _circle(73, 27, 3)),
+        _feature("Gujarat", _circle(71, 22, 2)),
+        _feature("Kerala", _circle(76, 10, 1)),
+    ]}
+    out = simplify_states(geo, norm_key, tolerance=0.02)
+    assert [s["name"] for s in out["states"]] == ["Rajasthan", "Gujarat", "Kerala"]
+    for s in out["states"]:
+        d = s["d"]
+        assert d.startswith("M") and d.endswith("Z")
+        assert d.count("L") >= 10       # a circle keeps its shape, not a 2-point sliver
+
+
+def test_feature_names_resolve_to_canonical_state_names():
+    geo = {"type": "FeatureCollection", "features": [
+        _feature("NCT of Delhi", _circle(77, 28.6, 0.3)),
+        _feature("Jammu & Kashmir", _circle(75, 34, 1)),
+        _feature("Orissa", _circle(85, 20, 1)),
+        _feature("RAJASTHAN", _circle(73, 27, 3), prop="NAME_1"),
+    ]}
+    out = simplify_states(geo, norm_key)
+    names = [s["name"] for s in out["states"]]
+    assert names == ["Delhi", "Jammu and Kashmir", "Odisha", "Rajasthan"]
+    assert [s["key"] for s in out["states"]] == [norm_key(n) for n in names]
+
+
+def test_bundled_geometry_covers_the_states_in_the_data():
+    import json
+
+    from src.geo import GEOJSON_PATH
+
+    out = simplify_states(json.loads(GEOJSON_PATH.read_text(encoding="utf-8")), norm_key)
+    names = {s["name"] for s in out["states"]}
+    assert {"Rajasthan", "Gujarat", "Karnataka", "Delhi", "Odisha", "Puducherry"} <= names
+    assert all(s["d"].count("L") >= 3 for s in out["states"])
@@ -0,0 +1,74 @@
+# tests/test_milestone_events.py
+import multiprocessing
+import os
+
+import pandas as pd
+
+from src.milestone_events import sync_milestone_events
+
+A, B = "PRJ-AAAAAAAAAA", "PRJ-BBBBBBBBBB"
+
+
+def _drop(root, name, rows):
+    drops = root / "drops"
+    drops.mkdir(exist_ok=True)
+    p = drops / name
+    pd.DataFrame(rows, columns=["Project ID", "Checkpoint", "Milestone", "Timestamp"]).to_csv(p, index=False)
+    st_ = p.stat()                     # make sure the fingerprint changes even within one mtime tick
+    os.utime(p, ns=(st_.st_atime_ns, st_.st_mtime_ns + 1_000_000_000))
+    return p
+
+
+ROWS = [
+    (A, "Land", "Survey", "2025-01-01"),
+    (A, "Land", "Acquired", "2025-02-01"),
+    (A, "PPA", "Signed", "2025-03-01"),
+]
+
+
+def test_appended_rows_are_ingested_once(tmp_path):
+    _drop(tmp_path, "team1.csv", ROWS)
+    state = sync_milestone_events(tmp_path)
+    assert state.set_index("Project_ID").loc[A, "Events"] == 3
+
+    _drop(tmp_path, "team1.csv", ROWS + [(B, "Land", "Survey", "2025-04-01")])
+    state = sync_milestone_events(tmp_path).set_index("Project_ID")
+    assert state.loc[A, "Events"] == 3
+    assert state.loc[B, "Events"] == 1
+
+    log = pd.read_csv(tmp_path / "event_log.csv")
+    assert list(log["Seq"]) == [1, 2, 3, 4]
+    assert not log.duplicated(["Project_ID", "Milestone", "Event_Time"]).any()
+
+
+def test_edited_drop_is_rejected(tmp_path, capsys):
+    _drop(tmp_path, "team1.csv", ROWS)
+    sync_milestone_events(tmp_path)
+
+    _drop(tmp_path, "team1.csv", [(A, "Land", "Survey", "2025-01-05")] + ROWS[1:] + [(B, "Land", "Survey", "2025-04-01")])
+    state = sync_milestone_events(tmp_path)
+    assert "EVENT_DROP_ERROR" in capsys.readouterr().out
+    assert B not in set(state["Project_ID"])
+    assert len(pd.read_csv(tmp_path / "event_log.csv")) == 3
+
+    sync_milestone_events(tmp_path)                 # not re-read until it changes again
+    assert "EVENT_DROP_ERROR" not in capsys.readouterr().out
+
+
+def test_concurrent_syncs_ingest_each_row_once(tmp_path):
+    # the app and the headless tools sync the same folder from separate processes
+    rows = [(A if i % 2 else B, "Land", f"Step {i}", f"2025-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}")
+            for i in range(5000)]
+    _drop(tmp_path, "bulk.csv", rows)
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=sync_milestone_events, args=(str(tmp_path),)) for _ in range(3)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(timeout=60)
+        assert p.exitcode == 0
+
+    log = pd.read_csv(tmp_path / "event_log.csv")
+    assert len(log) == len(rows)
+    assert log["Seq"].is_unique
+    assert sync_milestone_events(tmp_path)["Events"].sum() == len(rows)
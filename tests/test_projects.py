@@ -0,0 +1,52 @@
+# tests/test_projects.py
+import pandas as pd
+
+from src.projects import assign_project_ids, is_project_id
+
+ROWS = [
+    # name, developer id, state, location, capacity, type, date
+    ("Bikaner Solar", "DEV-1", "Rajasthan", "Bikaner, RJ", 300.0, "Solar", "2026-03-31"),
+    ("Bikaner Solar", "DEV-1", "Rajasthan", "Barju, Bikaner, RJ", 150.0, "Solar", "2026-12-31"),
+    ("Gadag-II", "DEV-2", "Karnataka", "Gadag", 441.0, "Wind", "2027-06-30"),
+    ("NHPC", "DEV-3", "Rajasthan", "Rajasthan", 300.0, "Solar", "2027-03-31"),
+    ("NHPC", "DEV-3", "Rajasthan", "Rajasthan", 300.0, "Solar", "2027-03-31"),
+    ("NHPC", "DEV-3", "Rajasthan", "Rajasthan", 150.0, "Solar", "2027-04-30"),
+    (None, "DEV-4", "Gujarat", "Gujarat", 100.0, "Solar", "2029-02-28"),
+]
+
+
+def _frame(rows):
+    return pd.DataFrame(rows, columns=["Project_Name", "Developer_ID", "State_Name", "Location",
+                                       "Capacity_MW", "Project_Type", "Date"])
+
+
+def _ids_by_content(df):
+    """(row content → sorted ids): identical rows are interchangeable, so compare as multisets."""
+    ids = assign_project_ids(df)
+    out = {}
+    for row, pid in zip(df.itertuples(index=False), ids):
+        out.setdefault(tuple(row), []).append(pid)
+    return {k: sorted(v) for k, v in out.items()}
+
+
+def test_ids_are_unique_and_valid():
+    ids = assign_project_ids(_frame(ROWS))
+    assert ids.is_unique
+    assert ids.map(is_project_id).all()
+
+
+def test_resorted_input_keeps_ids():
+    df = _frame(ROWS)
+    expected = _ids_by_content(df)
+    assert _ids_by_content(df.iloc[::-1]) == expected
+    assert _ids_by_content(df.sample(frac=1, random_state=7).reset_index(drop=True)) == expected
+
+
+def test_dropping_a_duplicate_keeps_other_ids():
+    df = _frame(ROWS)
+    before = _ids_by_content(df)
+    after = _ids_by_content(df.drop(index=4))        # one of the identical NHPC rows
+    for content, ids in after.items():
+        assert set(ids) <= set(before[content])
+    # the 150 MW sibling is matched by content, not by its position in the sheet
+    assert after[tuple(df.iloc[5])] == before[tuple(df.iloc[5])]
@@ -0,0 +1,53 @@
+# tests/test_report_diff.py
+import pandas as pd
+
+from src.projects import assign_project_ids
+from src.report_diff import diff_reports
+
+ROWS = [
+    # name, developer, state, location, capacity, type, COD
+    ("GUVNL", "ReNew", "Gujarat", "Gujarat", 100.0, "Solar", "2026-09-01"),
+    ("GUVNL", "ReNew", "Gujarat", "Gujarat", 110.0, "Solar", "2027-03-01"),
+    ("Gadag-II", "Adani", "Karnataka", "Gadag", 59.0, "Wind", "2026-06-30"),
+    ("Gadag-II", "Adani", "Karnataka", "Gadag", 500.0, "Wind", "2027-06-30"),
+    ("NHPC", "ReNew", "Rajasthan", "Rajasthan", 300.0, "Solar", "2027-03-31"),
+    ("NHPC", "ReNew", "Rajasthan", "Rajasthan", 300.0, "Solar", "2027-03-31"),
+    ("Bidar", "NTPC", "Karnataka", "Bidar", 200.0, "Solar", "2026-12-31"),
+]
+
+
+def _report(rows):
+    df = pd.DataFrame(rows, columns=["Project_Name", "Developer", "State_Name", "Location",
+                                     "Capacity_MW", "Project_Type", "Date"])
+    df["Date"] = pd.to_datetime(df["Date"])
+    df["Developer_Canonical"] = df["Developer"]
+    df["Developer_ID"] = "DEV-" + df["Developer"].str.upper()
+    df["Project_ID"] = assign_project_ids(df)
+    return df
+
+
+def _counts(d):
+    return len(d["added"]), len(d["removed"]), len(d["changed"])
+
+
+def test_reordered_report_has_no_changes():
+    df = _report(ROWS)
+    assert _counts(diff_reports(df, _report(ROWS[::-1]))) == (0, 0, 0)
+    assert diff_reports(df, _report(ROWS[::-1]))["unchanged"] == len(ROWS)
+
+
+def test_dropped_duplicate_is_the_one_removed():
+    d = diff_reports(_report(ROWS), _report(ROWS[1:]))
+    assert _counts(d) == (0, 1, 0)
+    assert d["removed"].loc[0, "Capacity_MW"] == 100.0
+
+
+def test_change_is_reported_on_the_matching_duplicate():
+    rows = list(ROWS)
+    rows[3] = ("Gadag-II", "Adani", "Karnataka", "Gadag", 500.0, "Wind", "2027-12-31")   # COD slipped
+    d = diff_reports(_report(ROWS), _report(rows[::-1]))
+    assert _counts(d) == (0, 0, 1)
+    ch = d["changed"].iloc[0]
+    assert ch["Changed_Fields"] == "Date"
+    assert ch["Capacity_Delta_MW"] == 0
+    assert ch["COD_Shift_Days"] == 184
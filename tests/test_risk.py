@@ -0,0 +1,36 @@
+# tests/test_risk.py
+from datetime import date
+
+import pandas as pd
+
+from src.risk import NO_PROGRESS, compute_schedule_risk
+
+ORDER = ["Land", "Connectivity", "PPA", "Commissioning"]
+TODAY = date(2025, 9, 1)
+
+
+def _risk(rows):
+    df = pd.DataFrame(rows, columns=["Checkpoint", "Milestone_Start_Date", "Date"])
+    return compute_schedule_risk(df, ORDER, today=TODAY)
+
+
+def test_final_checkpoint_is_never_behind_schedule():
+    r = _risk([("Commissioning", "2025-08-01", "2025-06-30"),     # COD passed, nothing remains
+               ("Commissioning", "2025-08-01", "2025-10-01")])
+    assert list(r["Risk_Reason"]) == ["", ""]
+    assert not r["At_Risk"].any()
+
+
+def test_unknown_checkpoint_is_no_progress_data_not_at_risk():
+    r = _risk([("Unassigned", None, "2025-06-30"), ("Unassigned", None, "2030-01-01")])
+    assert list(r["Risk_Reason"]) == [NO_PROGRESS, NO_PROGRESS]
+    assert not r["At_Risk"].any()
+
+
+def test_known_checkpoints_keep_their_rules():
+    r = _risk([("PPA", "2025-08-01", "2025-06-30"),               # COD passed
+               ("Land", "2025-08-01", "2025-12-31"),              # 3 checkpoints left, 121 days
+               ("Connectivity", "2024-12-01", "2028-01-01"),      # 274 days in milestone
+               ("Connectivity", "2025-08-01", "2028-01-01")])
+    assert list(r["Risk_Reason"]) == ["COD passed", "Behind schedule", "Stalled", ""]
+    assert list(r["At_Risk"]) == [True, True, True, False]
@@ -0,0 +1,51 @@
+# tests/test_rollups.py
+import pandas as pd
+
+from src.rollups import build_time_rollups, period_label, period_start, query_rollup
+
+
+def test_financial_year_turns_over_on_1_april():
+    dates = pd.Series(pd.to_datetime(["2025-03-31 00:00:00", "2025-04-01 00:00:00", "2026-03-31 23:59:00"]))
+    start = period_start(dates, "Financial year")
+    assert list(start) == list(pd.to_datetime(["2024-04-01", "2025-04-01", "2025-04-01"]))
+    assert list(period_label(start, "Financial year")) == ["FY2024-25", "FY2025-26", "FY2025-26"]
+
+
+def test_weeks_start_on_monday():
+    # W-SUN periods end on Sunday: Sunday 15 Jun belongs to the week of Monday 9 Jun
+    dates = pd.Series(pd.to_datetime(["2025-06-15 00:00:00", "2025-06-16 00:00:00", "2025-06-18 12:00:00"]))
+    start = period_start(dates, "Week")
+    assert list(start) == list(pd.to_datetime(["2025-06-09", "2025-06-16", "2025-06-16"]))
+    assert period_label(start, "Week").iloc[0] == "Wk of 09 Jun 2025"
+
+
+DF = pd.DataFrame({
+    "Project_Type": ["Solar", "Wind", "Solar", "Solar"],
+    "Checkpoint": ["Land", "Land", "PPA", "Land"],
+    "Milestone": ["Survey", "Survey", "Signed", "Acquired"],
+    "Capacity_MW": [100.0, 50.0, pd.NA, 25.0],
+    "Project_Row": 1,
+    "Date": pd.to_datetime(["2025-03-31", "2025-04-01", None, "2025-05-10"]),
+    "Milestone_Start_Date": pd.to_datetime(["2025-01-15", None, "2025-02-01", "2025-02-20"]),
+})
+
+
+def test_undated_rows_are_left_out_of_that_basis_only():
+    cube = build_time_rollups(DF)
+    cod = cube[(cube["Basis"] == "COD") & (cube["Granularity"] == "Month")]
+    ms = cube[(cube["Basis"] == "Milestone start") & (cube["Granularity"] == "Month")]
+    assert cod["Projects"].sum() == 3 and cod["Capacity_MW"].sum() == 175.0
+    assert ms["Projects"].sum() == 3 and ms["Capacity_MW"].sum() == 125.0
+    assert cube["Period"].notna().all()
+
+
+def test_filtered_query_sums_only_matching_cube_rows():
+    cube = build_time_rollups(DF)
+    out = query_rollup(cube, "COD", "Financial year", {"Project_Type": "Solar", "Checkpoint": None})
+    assert list(out["Label"]) == ["FY2024-25", "FY2025-26"]
+    assert list(out["Projects"]) == [1, 1]
+    assert list(out["Capacity_MW"]) == [100.0, 25.0]
+
+    out = query_rollup(cube, "COD", "Quarter", {"Project_Type": "Solar", "Checkpoint": "Land", "Milestone": "Survey"})
+    assert list(out["Label"]) == ["2025Q1"] and out["Projects"].sum() == 1
+    assert query_rollup(cube, "COD", "Week", {"Project_Type": "Hydro/PSP"}).empty
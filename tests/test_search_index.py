@@ -0,0 +1,19 @@
+# tests/test_search_index.py
+import pandas as pd
+
+from src.search_index import build_search_index
+
+
+def test_state_search_uses_resolved_state_and_location():
+    df = pd.DataFrame({
+        "Project_Name": ["Bhadla Park", "Gadag Wind", None],
+        "Developer": ["NTPC", "ReNew", "Juniper Green"],
+        "State": [pd.NA, pd.NA, pd.NA],
+        "Location": ["Bhadla, Jodhpur", "Gadag, KA", "Bikaner, RJ"],
+        "State_Name": ["Rajasthan", "Karnataka", "Rajasthan"],
+        "Capacity_MW": [300.0, 200.0, 100.0],
+    })
+    idx = build_search_index(df)
+    assert sorted(idx.search("rajasthan", limit=None)) == [0, 2]
+    assert list(idx.search("bikaner", limit=None)) == [2]
+    assert list(idx.search("karna", limit=None)) == [1]
@@ -0,0 +1,62 @@
+# tests/test_sessionize_logs.py
+import importlib.util
+from pathlib import Path
+
+_spec = importlib.util.spec_from_file_location(
+    "sessionize_logs", Path(__file__).resolve().parent.parent / "tools" / "sessionize_logs.py")
+sessionize_logs = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(sessionize_logs)
+
+
+def _rec(ts, event="state_change", key=None, value=None, sid="s1"):
+    rec = {"ts_utc": f"2025-06-16T{ts}Z", "session_id": sid, "event": event}
+    if key:
+        rec["fields"] = {"key": key, "value": value}
+    return rec
+
+
+def _run(records, idle_minutes=30):
+    sz = sessionize_logs.Sessionizer(idle_minutes)
+    for rec in records:
+        sz.add(rec)
+    return sz.finish()
+
+
+RECORDS = [
+    _rec("10:00:00", "page_view"),
+    _rec("10:00:10", key="selected_checkpoint", value="Land"),
+    _rec("10:00:30", key="selected_milestone", value="Survey"),
+    # one click on another checkpoint: the app clears the milestone, then sets the checkpoint
+    _rec("10:01:00", key="selected_milestone", value=""),
+    _rec("10:01:00.400000", key="selected_checkpoint", value="PPA"),
+    _rec("10:45:00", "page_view"),                 # 44 min idle → second visit
+    _rec("10:45:20", key="selected_state", value="Rajasthan"),
+]
+
+
+def test_checkpoint_change_merges_with_its_milestone_clear():
+    views, _ = _run(RECORDS)
+    first = views[views["visit"] == 1]
+    assert list(first["checkpoint"].astype(object).fillna("")) == ["", "Land", "Land", "PPA"]
+    assert list(first["milestone"].astype(object).fillna("")) == ["", "", "Survey", ""]
+
+
+def test_idle_gap_starts_a_new_visit():
+    views, sessions = _run(RECORDS)
+    assert list(sessions["visit"]) == [1, 2]
+    assert list(sessions["views"]) == [4, 2]
+    assert sessions["duration_s"].tolist() == [60.4, 20.0]
+    second = views[views["visit"] == 2]
+    assert list(second["state"].astype(object).fillna("")) == ["", "Rajasthan"]
+    # the gap is idle time, not dwell: the last view of visit 1 ends at its last record
+    assert views[views["visit"] == 1]["dwell_s"].iloc[-1] == 0.4
+
+
+def test_dwell_and_depth():
+    views, sessions = _run(RECORDS)
+    first = views[views["visit"] == 1]
+    assert list(first["seq"]) == [1, 2, 3, 4]
+    assert list(first["dwell_s"]) == [10.0, 20.0, 30.0, 0.4]
+    assert list(first["depth"]) == [0, 1, 2, 1]
+    assert list(sessions["max_depth"]) == [2, 0]
+    assert sessions["path"].iloc[0] == "(overview) → Land → Land / Survey → PPA"
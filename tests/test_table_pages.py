@@ -0,0 +1,44 @@
+# tests/test_table_pages.py
+import numpy as np
+import pandas as pd
+
+from src.table_pages import build_sort_index, page_count, page_slice
+
+DF = pd.DataFrame({
+    "Capacity_MW": pd.Series([100.0, pd.NA, 9.5, 20, np.nan, 300.0], dtype=object),
+    "Project_Name": ["beta", None, "Alpha", "gamma", "Delta", np.nan],
+})
+ALL = np.arange(len(DF))
+
+
+def test_missing_values_sort_last_both_ways():
+    idx = build_sort_index(DF, ["Project_Name"])
+    assert list(idx.ordered(ALL, "Project_Name")) == [2, 0, 4, 3, 1, 5]
+    assert list(idx.ordered(ALL, "Project_Name", descending=True)) == [3, 4, 0, 2, 1, 5]
+
+
+def test_object_column_of_floats_and_na_sorts_numerically():
+    # as text, "100.0" < "20" < "9.5"
+    idx = build_sort_index(DF, ["Capacity_MW"])
+    assert list(idx.ordered(ALL, "Capacity_MW")) == [2, 3, 0, 5, 1, 4]
+    assert list(idx.ordered(ALL, "Capacity_MW", descending=True)) == [5, 0, 3, 2, 1, 4]
+
+
+def test_subset_keeps_the_global_order():
+    idx = build_sort_index(DF, ["Capacity_MW", "Missing_Column"])
+    assert idx.columns == ["Capacity_MW"]
+    rows = np.array([4, 0, 3])
+    assert list(idx.ordered(rows, "Capacity_MW")) == [3, 0, 4]
+    assert list(idx.ordered(rows, "Capacity_MW", descending=True)) == [0, 3, 4]
+    assert len(idx.ordered(np.array([], dtype=np.int64), "Capacity_MW")) == 0
+
+
+def test_pages_are_clamped():
+    rows = np.arange(25)
+    assert page_count(25, 10) == 3
+    assert page_count(0, 10) == 1
+    assert list(page_slice(rows, 3, 10)) == list(range(20, 25))
+    assert list(page_slice(rows, 99, 10)) == list(range(20, 25))
+    assert list(page_slice(rows, 0, 10)) == list(range(10))
+    assert list(page_slice(rows, -4, 10)) == list(range(10))
+    assert len(page_slice(np.arange(0), 5, 10)) == 0
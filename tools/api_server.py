@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# tools/api_server.py
+# Local JSON API (GET only) over the same data the dashboard shows.
+# This script MUST NOT import streamlit or app.py — it uses src/loaders.py and
+# src/aggregates.py, the same code the dashboard runs.
+#
+# Endpoints (GET, all accept the filters below as query parameters):
+#   /api/version                 dataset version + project count
+#   /api/kpis                    the KPI strip numbers
+#   /api/aggregates/<dim>        Projects / Capacity_MW per dim
+#                                (state, type, owner, checkpoint, milestone, developer)
+#   /api/projects                filtered project list (limit, offset, sort, desc)
+# Filters: state, type, owner, checkpoint, milestone, developer
+#
+# Requests never change anything, but a (re)load is the app's load: it ingests
+# new milestone_events/drops/ into the event store and adds new developer
+# spellings to data/developer_ids.csv, under the same inter-process locks the
+# app takes, so it can run next to the dashboard.
+#
+# Every 200 response carries ETag = dataset version. Clients poll with
+# If-None-Match and get a bodiless 304 until a workbook / event drop changes.
+# resolve() validates the path and parameters before that check, so unknown
+# paths and bad parameters get their 404 / 400 even with a matching
+# If-None-Match; build() (filter, sort, serialize) only runs for a 200, and a
+# 304 never reloads the data.
+#
+# Usage:
+#   python tools/api_server.py --port 8600
+#   curl -i localhost:8600/api/aggregates/state?type=Solar
+
+import argparse
+import json
+import sys
+import threading
+from datetime import date
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+# Project root assumed as parent of this file's folder
+THIS_DIR = Path(__file__).resolve().parent
+ROOT_DIR = THIS_DIR.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.aggregates import AGG_DIMS, apply_filters, group_totals, kpi_summary  # noqa: E402
+from src.loaders import MILES_FILE, events_version, find_uc_file, load_dashboard  # noqa: E402
+from src.utils.versioning import dataset_version  # noqa: E402
+
+PROJECT_COLUMNS = ["Project_ID", "Project_Name", "Developer", "Developer_Canonical", "Owner_Class",
+                   "Project_Type", "Capacity_MW", "State_Name", "Checkpoint", "Milestone",
+                   "Milestone_Start_Date", "Date"]
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 5000
+
+
+class DashboardData:
+    """
+    The assigned project table, reloaded only when the source files change.
+    Same keys as the app: workbook fingerprints + event-drop fingerprint (+ day
+    while the random placeholder assignment is in use).
+    """
+
+    def __init__(self, root: Path, quiet: bool = False):
+        self.root = root
+        self.quiet = quiet
+        self._lock = threading.Lock()
+        self._key = None
+        self._day = None
+        self._from_events = False
+        self.version = None
+        self.df = pd.DataFrame()
+
+    def _source_key(self):
+        miles = self.root / MILES_FILE
+        return (dataset_version(miles, find_uc_file(self.root)), events_version(self.root))
+
+    def current(self):
+        key = self._source_key()
+        today = date.today()
+        with self._lock:
+            if key != self._key or (not self._from_events and today != self._day):
+                self._load(key, today)
+            return self.version, self.df
+
+    def _load(self, key, today):
+        loaded = load_dashboard(self.root)
+        self.df, self.version, self._from_events = loaded["df"], loaded["version"], loaded["from_events"]
+        self._key, self._day = key, today
+        print(f"[LOAD] {len(self.df):,} projects, version {self.version}")
+
+
+def _filters(qs: dict) -> dict:
+    return {col: qs[dim][0] for dim, col in AGG_DIMS.items() if qs.get(dim)}
+
+
+def _records(df: pd.DataFrame) -> list:
+    out = df.copy()
+    for c in ("Date", "Milestone_Start_Date"):
+        if c in out.columns:
+            out[c] = pd.to_datetime(out[c], errors="coerce").dt.strftime("%Y-%m-%d")
+    return json.loads(out.to_json(orient="records"))
+
+
+def resolve(path: str, qs: dict, df: pd.DataFrame):
+    """
+    (HTTPStatus.OK, request) or (error status, error payload). Only parses and
+    validates the path and parameters — no filtering, sorting or serializing —
+    so it can run before the If-None-Match check.
+    """
+    parts = [p for p in path.split("/") if p]
+    if parts[:1] != ["api"]:
+        return HTTPStatus.NOT_FOUND, {"error": "not found"}
+    parts = parts[1:]
+    filters = _filters(qs)
+
+    if parts == ["version"]:
+        return HTTPStatus.OK, {"endpoint": "version"}
+    if df.empty:
+        return HTTPStatus.SERVICE_UNAVAILABLE, {"error": "no project data loaded"}
+    if parts == ["kpis"]:
+        return HTTPStatus.OK, {"endpoint": "kpis", "filters": filters}
+    if len(parts) == 2 and parts[0] == "aggregates":
+        if parts[1] not in AGG_DIMS:
+            return HTTPStatus.NOT_FOUND, {"error": f"unknown dimension '{parts[1]}'",
+                                          "dimensions": list(AGG_DIMS)}
+        return HTTPStatus.OK, {"endpoint": "aggregates", "filters": filters, "dim": parts[1]}
+    if parts == ["projects"]:
+        try:
+            limit = int(qs.get("limit", [DEFAULT_LIMIT])[0])
+            offset = max(int(qs.get("offset", [0])[0]), 0)
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, {"error": "limit/offset must be integers"}
+        if limit < 0:
+            return HTTPStatus.BAD_REQUEST, {"error": "limit must be >= 0"}
+        sort = qs.get("sort", [None])[0]
+        if sort and sort not in PROJECT_COLUMNS:
+            return HTTPStatus.BAD_REQUEST, {"error": f"cannot sort by '{sort}'"}
+        return HTTPStatus.OK, {"endpoint": "projects", "filters": filters,
+                               "limit": min(limit, MAX_LIMIT), "offset": offset, "sort": sort,
+                               "desc": qs.get("desc", ["0"])[0].lower() in ("1", "true")}
+    return HTTPStatus.NOT_FOUND, {"error": "not found"}
+
+
+def build(req: dict, df: pd.DataFrame, version: str) -> dict:
+    """Response payload for a request that resolve() accepted."""
+    if req["endpoint"] == "version":
+        return {"version": version, "projects": len(df)}
+    filters = req["filters"]
+    fdf = apply_filters(df, filters)
+
+    if req["endpoint"] == "kpis":
+        return {"version": version, "filters": filters, **kpi_summary(fdf)}
+    if req["endpoint"] == "aggregates":
+        col = AGG_DIMS[req["dim"]]
+        agg = group_totals(fdf, col).rename(columns={col: req["dim"]})
+        return {"version": version, "filters": filters, "rows": _records(agg)}
+    # projects
+    if req["sort"]:
+        fdf = fdf.sort_values(req["sort"], ascending=not req["desc"],
+                              na_position="last", kind="stable")
+    offset, limit = req["offset"], req["limit"]
+    page = fdf[[c for c in PROJECT_COLUMNS if c in fdf.columns]].iloc[offset:offset + limit]
+    return {"version": version, "filters": filters, "total": len(fdf),
+            "offset": offset, "limit": limit, "rows": _records(page)}
+
+
+def route(path: str, qs: dict, df: pd.DataFrame, version: str):
+    """(status, payload) for one request; pure so it can be exercised without a socket."""
+    status, req = resolve(path, qs, df)
+    return (status, build(req, df, version)) if status == HTTPStatus.OK else (status, req)
+
+
+def make_handler(data: DashboardData):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            try:
+                version, df = data.current()
+            except Exception as e:
+                return self._send(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"load failed: {e}"})
+            status, req = resolve(url.path, parse_qs(url.query), df)
+            if status != HTTPStatus.OK:          # errors are never cached / revalidated
+                return self._send(status, req)
+            etag = f'"{version}"'
+            if etag in [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]:
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                return
+            self._send(status, build(req, df, version), etag)
+
+        def _send(self, status, payload, etag=None):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            if etag:
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "no-cache")   # always revalidate, usually a 304
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt, *args):
+            if not data.quiet:
+                super().log_message(fmt, *args)
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve dashboard aggregates as JSON")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Bind address (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8600, help="Port (default 8600)")
+    parser.add_argument("--root", type=str, default=str(ROOT_DIR), help="Folder holding the workbooks")
+    parser.add_argument("--quiet", action="store_true", help="Do not log every request")
+    args = parser.parse_args()
+
+    data = DashboardData(Path(args.root), quiet=args.quiet)
+    data.current()   # load up front so the first client isn't the one waiting
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(data))
+    print(f"[OK] Serving on http://{args.host}:{args.port}/api/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# tools/build_reports.py
+# Pre-render static HTML briefs for every state × checkpoint combination.
+# This script MUST NOT import streamlit or app.py — charts come from
+# src/charts.py (the same builders render_snapshot uses), data from src/loaders.py.
+#
+# Output (default static_reports/):
+#   index.html                     state × checkpoint grid linking every brief
+#   plotly.min.js                  written once, shared by all pages (no CDN)
+#   pages/<state>__<checkpoint>.html
+#   images/<state>__<checkpoint>__<chart>.png   only with --images and kaleido installed
+#   VERSION                        dataset version the pages were built from
+#
+# Pages are rendered in a process pool; each worker receives the project table
+# once (pool initializer) and then only (state, checkpoint) tasks. Serving the
+# folder (python -m http.server -d static_reports) is a zero-compute kiosk view.
+#
+# Usage:
+#   python tools/build_reports.py
+#   python tools/build_reports.py --workers 8 --images --force
+
+import argparse
+import html
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+# Project root assumed as parent of this file's folder
+THIS_DIR = Path(__file__).resolve().parent
+ROOT_DIR = THIS_DIR.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.aggregates import kpi_summary  # noqa: E402
+from src.charts import SNAPSHOT_CHARTS, time_rollup_fig  # noqa: E402
+from src.loaders import load_dashboard  # noqa: E402
+from src.rollups import build_time_rollups, query_rollup  # noqa: E402
+
+OUT_DIR = ROOT_DIR / "static_reports"
+ALL = "All"
+TABLE_COLUMNS = ["Project_ID", "Project_Name", "Developer", "Owner_Class", "Project_Type",
+                 "Capacity_MW", "State_Name", "Checkpoint", "Milestone", "Date"]
+
+PAGE_CSS = """
+body { font-family: Poppins, system-ui, Arial; color: #0F4237; margin: 24px; background: #F7FBF9; }
+h1 { font-size: 26px; margin: 0 0 4px; } .sub { opacity: .7; margin-bottom: 16px; }
+.kpis { display: grid; grid-template-columns: repeat(5, 1fr); gap: 12px; margin-bottom: 16px; }
+.card { border-radius: 16px; padding: 14px 16px; background: #fff; border: 1px solid #e5ece8; }
+.kpi-label { font-size: 12px; font-weight: 600; color: #2f6a57; text-transform: uppercase; }
+.kpi-value { font-size: 24px; font-weight: 800; margin-top: 6px; }
+.charts { display: grid; grid-template-columns: 1fr 1fr; gap: 12px; }
+table { border-collapse: collapse; font-size: 12px; width: 100%; background: #fff; }
+th, td { border: 1px solid #e5ece8; padding: 4px 6px; text-align: left; }
+a { color: #1b5e20; }
+"""
+
+_DF = None   # per-worker project table, set by _init_worker
+
+
+def slug(value) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", str(value).lower()).strip("-") or "none"
+
+
+def page_name(state, checkpoint) -> str:
+    return f"{slug(state or 'all-states')}__{slug(checkpoint or 'all-checkpoints')}"
+
+
+def select(df: pd.DataFrame, state, checkpoint) -> pd.DataFrame:
+    if state:
+        df = df[df["State_Name"] == state]
+    if checkpoint:
+        df = df[df["Checkpoint"] == checkpoint]
+    return df
+
+
+def _kpi_cards(k: dict) -> str:
+    cards = [
+        ("Total Projects", f"{k['total_projects']:,}"),
+        ("Total Capacity (MW)", f"{k['total_capacity_mw']:,}"),
+        ("Avg Capacity / Project", f"{k['avg_capacity_mw']}"),
+        ("Solar Projects", f"{k['solar_projects']:,}"),
+        ("Wind / Hybrid", f"{k['wind_projects']:,} / {k['hybrid_projects']:,}"),
+    ]
+    return "".join(f"<div class='card'><div class='kpi-label'>{label}</div>"
+                   f"<div class='kpi-value'>{value}</div></div>" for label, value in cards)
+
+
+def _figures(fdf: pd.DataFrame):
+    figs = [(name, build(fdf)) for name, build in SNAPSHOT_CHARTS]
+    ts = query_rollup(build_time_rollups(fdf), "COD", "Quarter", None)
+    figs.append(("cod_by_quarter", time_rollup_fig(ts, "Capacity_MW", "COD", "Quarter")))
+    return [(name, fig) for name, fig in figs if fig is not None]
+
+
+def _init_worker(df: pd.DataFrame):
+    global _DF
+    _DF = df
+
+
+def render_page(state, checkpoint, out_dir: str, version: str, images: bool) -> dict:
+    """Write one brief; runs inside a pool worker."""
+    out_dir = Path(out_dir)
+    fdf = select(_DF, state, checkpoint)
+    name = page_name(state, checkpoint)
+    k = kpi_summary(fdf)
+
+    charts = []
+    for chart, fig in _figures(fdf):
+        charts.append(f"<div class='card'>{fig.to_html(full_html=False, include_plotlyjs=False)}</div>")
+        if images:
+            fig.write_image(out_dir / "images" / f"{name}__{chart}.png", width=900, height=fig.layout.height or 380)
+
+    table = (fdf[[c for c in TABLE_COLUMNS if c in fdf.columns]]
+             .sort_values("Capacity_MW", ascending=False, na_position="last")
+             .to_html(index=False, na_rep="", float_format=lambda v: f"{v:,.1f}"))
+    title = f"{state or 'All states'} · {checkpoint or 'All checkpoints'}"
+    page = f"""<!doctype html>
+<html><head><meta charset="utf-8"><title>{html.escape(title)}</title>
+<style>{PAGE_CSS}</style><script src="../plotly.min.js"></script></head>
+<body>
+<p><a href="../index.html">← All briefs</a></p>
+<h1>{html.escape(title)}</h1>
+<div class="sub">RE projects under construction · data version {version}</div>
+<div class="kpis">{_kpi_cards(k)}</div>
+<div class="charts">{''.join(charts)}</div>
+<h2>Projects</h2>
+{table}
+</body></html>"""
+    (out_dir / "pages" / f"{name}.html").write_text(page, encoding="utf-8")
+    return {"state": state, "checkpoint": checkpoint, "page": f"pages/{name}.html",
+            "projects": k["total_projects"], "capacity_mw": k["total_capacity_mw"]}
+
+
+def write_index(out_dir: Path, results: list, states: list, checkpoints: list, version: str):
+    by_cell = {(r["state"], r["checkpoint"]): r for r in results}
+    head = "".join(f"<th>{html.escape(cp or ALL)}</th>" for cp in checkpoints)
+    rows = []
+    for st_ in states:
+        cells = []
+        for cp in checkpoints:
+            r = by_cell.get((st_, cp))
+            cells.append(f"<td><a href='{r['page']}'>{r['projects']:,} · {r['capacity_mw']:,} MW</a></td>"
+                         if r else "<td></td>")
+        rows.append(f"<tr><th>{html.escape(st_ or ALL)}</th>{''.join(cells)}</tr>")
+    page = f"""<!doctype html>
+<html><head><meta charset="utf-8"><title>RE projects under construction — briefs</title>
+<style>{PAGE_CSS}</style></head>
+<body>
+<h1>RE projects under construction — briefs</h1>
+<div class="sub">Built {datetime.now().isoformat(timespec='seconds')} · data version {version} ·
+projects · capacity per state (rows) and checkpoint (columns)</div>
+<table><tr><th>State</th>{head}</tr>{''.join(rows)}</table>
+</body></html>"""
+    (out_dir / "index.html").write_text(page, encoding="utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-render static per-state / per-checkpoint HTML briefs")
+    parser.add_argument("--out", type=str, default=str(OUT_DIR), help="Output folder (default static_reports/)")
+    parser.add_argument("--root", type=str, default=str(ROOT_DIR), help="Folder holding the workbooks")
+    parser.add_argument("--workers", type=int, default=min(8, os.cpu_count() or 1), help="Worker processes")
+    parser.add_argument("--images", action="store_true", help="Also write PNGs (needs kaleido)")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if VERSION matches")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    loaded = load_dashboard(args.root)
+    df, version = loaded["df"], loaded["version"]
+    if df.empty:
+        print("[ERROR] No project data found — nothing to render.")
+        return
+    out_dir = Path(args.out)
+    if not args.force and (out_dir / "VERSION").exists() \
+            and (out_dir / "VERSION").read_text(encoding="utf-8").strip() == version:
+        print(f"[OK] {out_dir} is already at version {version} (use --force to rebuild)")
+        return
+
+    images = args.images
+    if images:
+        try:
+            import kaleido  # noqa: F401
+        except ImportError:
+            print("[WARN] kaleido is not installed — writing HTML only.")
+            images = False
+
+    (out_dir / "pages").mkdir(parents=True, exist_ok=True)
+    for old in (out_dir / "pages").glob("*.html"):   # combinations can disappear between versions
+        old.unlink()
+    for old in (out_dir / "images").glob("*.png"):  # also when this run writes HTML only
+        old.unlink()
+    if images:
+        (out_dir / "images").mkdir(parents=True, exist_ok=True)
+    from plotly.offline import get_plotlyjs
+    (out_dir / "plotly.min.js").write_text(get_plotlyjs(), encoding="utf-8")
+
+    states = [None] + sorted(df["State_Name"].dropna().unique())
+    checkpoints = [None] + [cp for cp in loaded["checkpoint_order"] if (df["Checkpoint"] == cp).any()]
+    if (df["Checkpoint"] == "Unassigned").any():
+        checkpoints.append("Unassigned")
+    tasks = [(s, cp) for s in states for cp in checkpoints if not select(df, s, cp).empty]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(df,)) as pool:
+        futures = [pool.submit(render_page, s, cp, str(out_dir), version, images) for s, cp in tasks]
+        for fut in as_completed(futures):
+            results.append(fut.result())
+
+    write_index(out_dir, results, states, checkpoints, version)
+    (out_dir / "VERSION").write_text(version, encoding="utf-8")
+    print(f"[OK] {len(results)} briefs in {time.perf_counter() - t0:.1f}s "
+          f"({args.workers} workers) → {out_dir / 'index.html'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# tools/load_test.py
+# Headless concurrent-session load harness for app.py.
+#
+# Uses Streamlit's app testing framework (streamlit.testing.v1.AppTest): each
+# simulated session is its own AppTest running app.py in THIS process, so
+# sessions share st.cache_data / st.cache_resource and the GIL exactly like
+# sessions on one Streamlit server do. Each session then performs random
+# interactions (seeded):
+#   - click a checkpoint button          (cp_btn_*)
+#   - click a milestone button           (ms_btn_*, when a checkpoint is open)
+#   - change "Filter — Project Type"
+# and every resulting rerun is timed.
+#
+# Reported per session count: rerun latency p50 / p90 / p99 / max, throughput
+# (runs per second across all sessions) and process RSS (peak, and the growth
+# over the warmed-up baseline per session).
+#
+# Usage:
+#   python tools/load_test.py --sessions 1,2,4,8 --actions 10
+#   python tools/load_test.py --sessions 16 --actions 5 --csv load.csv
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Project root assumed as parent of this file's folder
+THIS_DIR = Path(__file__).resolve().parent
+ROOT_DIR = THIS_DIR.parent
+
+TYPE_FILTER_LABEL = "Filter — Project Type"
+
+
+def rss_mb() -> float:
+    """Current resident set size of this process in MB (Linux /proc, else peak RSS)."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        return float("nan")
+
+
+def percentile(values, q):
+    if not values:
+        return float("nan")
+    s = sorted(values)
+    k = (len(s) - 1) * q
+    lo, hi = int(k), min(int(k) + 1, len(s) - 1)
+    return s[lo] + (s[hi] - s[lo]) * (k - lo)
+
+
+def _timed_run(at, timeout):
+    t = time.perf_counter()
+    at.run(timeout=timeout)
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return time.perf_counter() - t
+
+
+def _random_action(at, rng):
+    """Queue one user interaction on `at`; returns its name."""
+    ms_buttons = [b for b in at.button if b.key and b.key.startswith("ms_btn_")]
+    cp_buttons = [b for b in at.button if b.key and b.key.startswith("cp_btn_")]
+    type_filter = next((s for s in at.selectbox if s.label == TYPE_FILTER_LABEL), None)
+    choices = []
+    if cp_buttons:
+        choices.append("checkpoint")
+    if ms_buttons:
+        choices.append("milestone")
+    if type_filter is not None:
+        choices.append("type_filter")
+    if not choices:
+        return None
+    action = rng.choice(choices)
+    if action == "checkpoint":
+        rng.choice(cp_buttons).click()
+    elif action == "milestone":
+        rng.choice(ms_buttons).click()
+    else:
+        type_filter.select(rng.choice([o for o in type_filter.options if o != type_filter.value]))
+    return action
+
+
+def run_session(sid: int, actions: int, seed: int, timeout: float, start: threading.Barrier):
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed + sid)
+    at = AppTest.from_file(str(ROOT_DIR / "app.py"), default_timeout=timeout)
+    start.wait()
+    samples = [("initial", _timed_run(at, timeout))]
+    for _ in range(actions):
+        action = _random_action(at, rng)
+        if action is None:
+            break
+        samples.append((action, _timed_run(at, timeout)))
+    return samples
+
+
+def run_level(n: int, actions: int, seed: int, timeout: float, base_rss: float = 0.0) -> dict:
+    start = threading.Barrier(n)
+    peak, done = [rss_mb()], threading.Event()
+
+    def sample():                       # peak RSS while the sessions are alive
+        while not done.wait(0.1):
+            peak.append(rss_mb())
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    t0 = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=n) as pool:
+            futures = [pool.submit(run_session, i, actions, seed, timeout, start) for i in range(n)]
+            results = [f.result() for f in futures]
+    finally:
+        done.set()
+        sampler.join()
+    wall = time.perf_counter() - t0
+    reruns = [dt for samples in results for action, dt in samples if action != "initial"]
+    initial = [dt for samples in results for action, dt in samples if action == "initial"]
+    rss = max(peak)
+    return {
+        "sessions": n,
+        "reruns": len(reruns),
+        "initial_p50_ms": percentile(initial, 0.50) * 1000,
+        "p50_ms": percentile(reruns, 0.50) * 1000,
+        "p90_ms": percentile(reruns, 0.90) * 1000,
+        "p99_ms": percentile(reruns, 0.99) * 1000,
+        "max_ms": max(reruns, default=float("nan")) * 1000,
+        "throughput_rps": (len(reruns) + len(initial)) / wall if wall else float("nan"),
+        "peak_rss_mb": rss,
+        "rss_per_session_mb": (rss - base_rss) / n,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate N concurrent dashboard sessions and time reruns")
+    parser.add_argument("--sessions", type=str, default="1,2,4,8", help="Comma-separated session counts")
+    parser.add_argument("--actions", type=int, default=10, help="Interactions per session")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for the interaction mix")
+    parser.add_argument("--timeout", type=float, default=300, help="Per-rerun timeout in seconds")
+    parser.add_argument("--no-warmup", action="store_true", help="Measure the cold first load too")
+    parser.add_argument("--csv", type=str, default="", help="Optional CSV file for the results")
+    args = parser.parse_args()
+
+    os.chdir(ROOT_DIR)   # the app resolves its workbooks relative to the working directory
+    levels = [int(x) for x in args.sessions.split(",") if x.strip()]
+    if not args.no_warmup:
+        t = time.perf_counter()
+        run_level(1, 0, args.seed, args.timeout)     # fills the shared caches once
+        print(f"[WARMUP] cold load {time.perf_counter() - t:.1f}s, RSS {rss_mb():.0f} MB")
+    base_rss = rss_mb()   # per-session RSS is measured on top of the loaded caches
+
+    cols = ["sessions", "reruns", "initial_p50_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms",
+            "throughput_rps", "peak_rss_mb", "rss_per_session_mb"]
+    rows = []
+    print(f"baseline RSS {base_rss:.0f} MB")
+    print(" ".join(f"{c:>18}" for c in cols))
+    for n in levels:
+        row = run_level(n, args.actions, args.seed, args.timeout, base_rss)
+        rows.append(row)
+        print(" ".join(f"{row[c]:>18.1f}" if isinstance(row[c], float) else f"{row[c]:>18}" for c in cols))
+
+    if args.csv:
+        lines = [",".join(cols)] + [",".join(f"{r[c]:.3f}" if isinstance(r[c], float) else str(r[c])
+                                            for c in cols) for r in rows]
+        Path(args.csv).write_text("\n".join(lines) + "\n", encoding="utf-8")
+        print(f"[OK] Wrote {args.csv}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# tools/sessionize_logs.py
+# Rebuild per-session drill-down funnels from the daily activity logs.
+# This script MUST NOT import streamlit or app.py.
+#
+# Input: logs/activity_YYYY-MM-DD.txt, one JSON record per line as written by
+# log_event() in app.py:
+#   {"ts_utc": "...Z", "ts_ist": "...", "session_id": "...", "event": "page_view" | "state_change",
+#    "fields": {"key": "selected_checkpoint" | "selected_milestone" | "selected_state", "value": "..."}}
+#
+# One streaming pass per day file (records are appended in time order), keeping
+# only the open sessions in memory. A "view" is the (checkpoint, milestone,
+# state) a session is looking at; every change closes the current view with its
+# dwell time. A gap longer than --idle-minutes starts a new visit.
+#
+# Output (default logs/sessions/), one partition per day file:
+#   views_<date>.<ext>      session_id, visit, seq, checkpoint, milestone, state,
+#                           start_utc, dwell_s, depth (0 overview, 1 checkpoint, 2 milestone)
+#   sessions_<date>.<ext>   session_id, visit, start_utc, end_utc, duration_s, views,
+#                           max_depth, path ("Checkpoint → Checkpoint / Milestone → …")
+#   manifest.json           day files already processed (name|size|mtime)
+# <ext> is parquet when pyarrow is installed, else csv.gz. Unchanged day files
+# are skipped on the next run, so only today's file is ever re-read.
+#
+# Usage:
+#   python tools/sessionize_logs.py                 # update partitions + print summary
+#   python tools/sessionize_logs.py --summary-only  # summary from existing partitions
+#   python tools/sessionize_logs.py --rebuild --idle-minutes 20
+
+import argparse
+import json
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+# Project root assumed as parent of this file's folder
+THIS_DIR = Path(__file__).resolve().parent
+ROOT_DIR = THIS_DIR.parent
+LOG_DIR = ROOT_DIR / "logs"
+OUT_DIR = LOG_DIR / "sessions"
+
+STATE_KEYS = {"selected_checkpoint": "checkpoint", "selected_milestone": "milestone", "selected_state": "state"}
+MERGE_SECONDS = 1.0      # one click logs several state_change records in the same rerun
+VIEW_COLUMNS = ["session_id", "visit", "seq", "checkpoint", "milestone", "state", "start_utc", "dwell_s", "depth"]
+SESSION_COLUMNS = ["session_id", "visit", "start_utc", "end_utc", "duration_s", "views", "max_depth", "path"]
+
+
+def _parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def to_dt(val):
+    if not val:
+        return None
+    try:
+        return datetime.fromisoformat(str(val).replace("Z", "+00:00"))
+    except Exception:
+        return None
+
+
+def view_label(v: dict) -> str:
+    label = " / ".join(x for x in (v["checkpoint"], v["milestone"]) if x) or "(overview)"
+    return f"{label} [{v['state']}]" if v["state"] else label
+
+
+class _Session:
+    __slots__ = ("sid", "visit", "start", "last", "current", "views")
+
+    def __init__(self, sid, visit, ts):
+        self.sid, self.visit, self.start, self.last = sid, visit, ts, ts
+        self.current = {"checkpoint": None, "milestone": None, "state": None}
+        self.views = [dict(self.current, start=ts)]
+
+
+class Sessionizer:
+    """Feed records in time order with add(); finished sessions accumulate as columns."""
+
+    def __init__(self, idle_minutes: float = 30):
+        self.idle = idle_minutes * 60
+        self.open = {}
+        self.visits = Counter()
+        self.view_cols = {c: [] for c in VIEW_COLUMNS}
+        self.session_cols = {c: [] for c in SESSION_COLUMNS}
+
+    def add(self, rec: dict):
+        sid, ts = rec.get("session_id"), to_dt(rec.get("ts_utc"))
+        if not sid or ts is None:
+            return
+        s = self.open.get(sid)
+        if s is not None and (ts - s.last).total_seconds() > self.idle:
+            self._close(s)
+            s = None
+        if s is None:
+            self.visits[sid] += 1
+            s = self.open[sid] = _Session(sid, self.visits[sid], ts)
+        s.last = ts
+
+        fields = rec.get("fields") or {}
+        if rec.get("event") != "state_change" or fields.get("key") not in STATE_KEYS:
+            return
+        value = str(fields.get("value") or "").strip() or None
+        col = STATE_KEYS[fields["key"]]
+        if s.current[col] == value:
+            return
+        s.current = dict(s.current, **{col: value})
+        if col == "checkpoint":
+            s.current["milestone"] = None       # the app clears the milestone with the checkpoint
+        last = s.views[-1]
+        if (ts - last["start"]).total_seconds() <= MERGE_SECONDS and len(s.views) > 1:
+            s.views[-1] = dict(s.current, start=last["start"])
+        else:
+            s.views.append(dict(s.current, start=ts))
+
+    def _close(self, s: _Session):
+        self.open.pop(s.sid, None)
+        depths = []
+        for seq, v in enumerate(s.views, start=1):
+            end = s.views[seq]["start"] if seq < len(s.views) else s.last
+            depth = 2 if v["milestone"] else (1 if v["checkpoint"] else 0)
+            depths.append(depth)
+            for c, val in zip(VIEW_COLUMNS, [s.sid, s.visit, seq, v["checkpoint"], v["milestone"],
+                                             v["state"], v["start"], (end - v["start"]).total_seconds(), depth]):
+                self.view_cols[c].append(val)
+        path = " → ".join(view_label(v) for v in s.views)
+        for c, val in zip(SESSION_COLUMNS, [s.sid, s.visit, s.start, s.last,
+                                            (s.last - s.start).total_seconds(), len(s.views),
+                                            max(depths), path]):
+            self.session_cols[c].append(val)
+
+    def finish(self):
+        for s in list(self.open.values()):
+            self._close(s)
+        views = pd.DataFrame(self.view_cols, columns=VIEW_COLUMNS)
+        sessions = pd.DataFrame(self.session_cols, columns=SESSION_COLUMNS)
+        for c in ("checkpoint", "milestone", "state"):
+            views[c] = views[c].astype("category")
+        for df in (views, sessions):
+            for c in ("visit", "seq", "depth", "views", "max_depth"):
+                if c in df.columns:
+                    df[c] = df[c].astype("int32")
+        return views, sessions
+
+
+def sessionize_file(path: Path, idle_minutes: float):
+    sz = Sessionizer(idle_minutes)
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line.startswith("{"):
+                continue
+            try:
+                sz.add(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return sz.finish()
+
+
+def _fingerprint(p: Path) -> str:
+    st_ = p.stat()
+    return f"{p.name}|{st_.st_size}|{st_.st_mtime_ns}"
+
+
+def _write(df: pd.DataFrame, base: Path, parquet: bool):
+    if parquet:
+        df.to_parquet(base.with_suffix(".parquet"), index=False)
+    else:
+        df.to_csv(base.with_suffix(".csv.gz"), index=False, compression="gzip")
+
+
+def _read_all(out_dir: Path, prefix: str) -> pd.DataFrame:
+    parts = [pd.read_parquet(p) for p in sorted(out_dir.glob(f"{prefix}_*.parquet"))]
+    parts += [pd.read_csv(p) for p in sorted(out_dir.glob(f"{prefix}_*.csv.gz"))]
+    parts = [p for p in parts if not p.empty]
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+
+
+def update_partitions(log_dir: Path, out_dir: Path, idle_minutes: float, rebuild: bool) -> list:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / "manifest.json"
+    manifest = {} if rebuild or not manifest_path.exists() else json.loads(manifest_path.read_text(encoding="utf-8"))
+    if manifest.get("idle_minutes") != idle_minutes:
+        manifest = {"idle_minutes": idle_minutes, "files": {}}
+    parquet = _parquet_available()
+
+    done = []
+    for p in sorted(log_dir.glob("activity_*.txt")):
+        if manifest["files"].get(p.name) == _fingerprint(p):
+            continue
+        day = p.stem.split("_")[-1]
+        views, sessions = sessionize_file(p, idle_minutes)
+        for old in out_dir.glob(f"*_{day}.*"):
+            old.unlink()
+        _write(views, out_dir / f"views_{day}", parquet)
+        _write(sessions, out_dir / f"sessions_{day}", parquet)
+        manifest["files"][p.name] = _fingerprint(p)
+        done.append((p.name, len(sessions), len(views)))
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return done
+
+
+def summarize(out_dir: Path, top: int = 10) -> str:
+    views = _read_all(out_dir, "views")
+    sessions = _read_all(out_dir, "sessions")
+    lines = ["===== Dashboard sessions — drill-down funnel ====="]
+    if sessions.empty:
+        lines.append("No sessions found.")
+        return "\n".join(lines)
+    n = len(sessions)
+    lines.append(f"Sessions (visits): {n:,}   median duration: {sessions['duration_s'].median():.0f}s")
+    lines.append("Funnel:")
+    for depth, label in [(0, "opened the dashboard"), (1, "opened a checkpoint"), (2, "opened a milestone")]:
+        k = int((sessions["max_depth"] >= depth).sum())
+        lines.append(f"  - {label:<22} {k:>6,}  ({k / n:.0%})")
+
+    drilled = views[views["depth"] > 0]
+    if not drilled.empty:
+        hot = (drilled.assign(checkpoint=drilled["checkpoint"].astype(str),
+                              milestone=drilled["milestone"].astype(object).where(drilled["milestone"].notna(), ""))
+                      .groupby(["checkpoint", "milestone"])
+                      .agg(sessions=("session_id", "nunique"), median_dwell_s=("dwell_s", "median"))
+                      .sort_values(["sessions", "median_dwell_s"], ascending=False).head(top))
+        lines.append("")
+        lines.append("Most visited views (pre-warm candidates):")
+        for (cp, ms), r in hot.iterrows():
+            lines.append(f"  - {cp}{' / ' + ms if ms else ''}: {int(r.sessions):,} sessions, "
+                         f"median dwell {r.median_dwell_s:.0f}s")
+    lines.append("")
+    lines.append("Most common paths:")
+    for path, cnt in sessions["path"].value_counts().head(top).items():
+        lines.append(f"  - {cnt:>5,} × {path}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sessionize activity logs into columnar drill-down tables")
+    parser.add_argument("--log-dir", type=str, default=str(LOG_DIR), help="Folder with activity_*.txt (default logs/)")
+    parser.add_argument("--out", type=str, default="", help="Output folder (default logs/sessions)")
+    parser.add_argument("--idle-minutes", type=float, default=30, help="Gap that starts a new visit")
+    parser.add_argument("--rebuild", action="store_true", help="Re-process every day file")
+    parser.add_argument("--summary-only", action="store_true", help="Only summarize existing partitions")
+    parser.add_argument("--top", type=int, default=10, help="Rows in the summary lists")
+    args = parser.parse_args()
+
+    out_dir = Path(args.out) if args.out else OUT_DIR
+    if not args.summary_only:
+        log_dir = Path(args.log_dir)
+        if not log_dir.is_dir():
+            print(f"[ERROR] Log folder not found: {log_dir}")
+            return
+        done = update_partitions(log_dir, out_dir, args.idle_minutes, args.rebuild)
+        for name, n_sessions, n_views in done:
+            print(f"[OK] {name}: {n_sessions:,} sessions, {n_views:,} views")
+        if not done:
+            print("[OK] All day files already sessionized.")
+        print(f"[OK] Tables in {out_dir} ({'parquet' if _parquet_available() else 'csv.gz'})")
+        print("")
+    print(summarize(out_dir, args.top))
+
+if __name__ == "__main__":
+    main()
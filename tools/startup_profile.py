@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# tools/startup_profile.py
+# Cold-start profile report for app.py.
+#
+# Runs the app once in a FRESH Python process (cold imports, empty st.cache_*)
+# through streamlit.testing's AppTest, under `-X importtime` and cProfile, then
+# once more warm. Reports:
+#   - first paint: when the title and the workflow bar were emitted
+#   - cold first run vs warm rerun wall time
+#   - heaviest top-level imports (cumulative, from -X importtime)
+#   - app.py / src functions by cumulative time (loaders, index builds, charts…)
+#
+# Usage:
+#   python tools/startup_profile.py
+#   python tools/startup_profile.py --top 30 --out startup_profile.txt
+
+import argparse
+import cProfile
+import json
+import os
+import pstats
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Project root assumed as parent of this file's folder
+THIS_DIR = Path(__file__).resolve().parent
+ROOT_DIR = THIS_DIR.parent
+
+PAINT_MARKERS = {"title": "main-title", "workflow": "Project Process Workflow"}
+
+
+def child(stats_path: str):
+    """Runs inside the profiled process; prints one JSON line of timings."""
+    t0 = time.perf_counter()
+    import streamlit
+    from streamlit.delta_generator import DeltaGenerator
+    from streamlit.testing.v1 import AppTest
+
+    painted = {}
+
+    def watch(fn):
+        def wrapper(*args, **kwargs):
+            body = " ".join(str(a) for a in args[:2]) + str(kwargs.get("body", ""))
+            for name, marker in PAINT_MARKERS.items():
+                if name not in painted and marker in body:
+                    painted[name] = time.perf_counter() - run_start
+            return fn(*args, **kwargs)
+        return wrapper
+
+    streamlit.markdown = watch(streamlit.markdown)             # st.markdown(...)
+    DeltaGenerator.markdown = watch(DeltaGenerator.markdown)   # slot.markdown(...)
+
+    # AppTest executes the script on its own thread: start a profiler in every new thread
+    profilers = []
+
+    def start_profiler(frame, event, arg):
+        sys.setprofile(None)
+        prof = cProfile.Profile()
+        profilers.append(prof)
+        prof.enable()
+
+    os.chdir(ROOT_DIR)
+    at = AppTest.from_file(str(ROOT_DIR / "app.py"), default_timeout=600)
+    run_start = time.perf_counter()
+    threading.setprofile(start_profiler)
+    at.run()
+    threading.setprofile(None)
+    cold = time.perf_counter() - run_start
+    stats = None
+    for prof in profilers:
+        prof.create_stats()
+        if prof.stats:
+            stats = pstats.Stats(prof) if stats is None else stats.add(prof)
+    if stats is not None:
+        stats.dump_stats(stats_path)
+
+    t = time.perf_counter()
+    at.run()
+    warm = time.perf_counter() - t
+    print(json.dumps({"harness_import_s": run_start - t0, "cold_run_s": cold, "warm_rerun_s": warm,
+                      "painted": painted, "exception": [str(e.message) for e in at.exception]}))
+
+
+def top_imports(importtime_stderr: str, n: int):
+    """Top-level modules by cumulative import time (µs) from -X importtime output."""
+    rows = []
+    for line in importtime_stderr.splitlines():
+        parts = line.split("|")
+        if not line.startswith("import time:") or len(parts) != 3 or "cumulative" in line:
+            continue
+        name = parts[2]
+        if len(name) - len(name.lstrip()) == 1:     # nested imports are indented further
+            rows.append((int(parts[1]), name.strip()))
+    return sorted(rows, reverse=True)[:n]
+
+
+def app_functions(stats_path: str, n: int):
+    if not Path(stats_path).exists():
+        return []
+    st_ = pstats.Stats(stats_path)
+    root = str(ROOT_DIR)
+    rows = []
+    for (filename, line, func), (cc, nc, tt, ct, callers) in st_.stats.items():
+        if filename.startswith(root) and "/tools/" not in filename:
+            rel = os.path.relpath(filename, root)
+            rows.append((ct, nc, f"{rel}:{line} {func}"))
+    return sorted(rows, reverse=True)[:n]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile a cold start of the dashboard")
+    parser.add_argument("--top", type=int, default=20, help="Rows per section")
+    parser.add_argument("--out", type=str, default="", help="Optional file for the report")
+    parser.add_argument("--child", type=str, default="", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stats_path = str(Path(tmp) / "startup.prof")
+        proc = subprocess.run([sys.executable, "-X", "importtime", __file__, "--child", stats_path],
+                              capture_output=True, text=True, cwd=ROOT_DIR)
+        timings = next((json.loads(l) for l in reversed(proc.stdout.splitlines()) if l.startswith("{")), None)
+        if proc.returncode != 0 or timings is None:
+            print(proc.stdout[-4000:], proc.stderr[-4000:], sep="\n")
+            raise SystemExit("[ERROR] profiled run failed")
+        imports = top_imports(proc.stderr, args.top)
+        funcs = app_functions(stats_path, args.top)
+
+    painted = timings["painted"]
+    lines = ["===== Dashboard cold-start profile =====",
+             f"Harness + streamlit import: {timings['harness_import_s']:.2f}s",
+             f"Cold first run:             {timings['cold_run_s']:.2f}s",
+             f"Warm rerun:                 {timings['warm_rerun_s']:.2f}s",
+             "First paint (from script start):"]
+    for name in PAINT_MARKERS:
+        lines.append(f"  - {name:<9} {painted[name]:.2f}s" if name in painted else f"  - {name:<9} not emitted")
+    if timings["exception"]:
+        lines.append(f"App exceptions: {timings['exception']}")
+    lines += ["", "Heaviest top-level imports (cumulative ms):"]
+    lines += [f"  {us / 1000:>8.1f}  {name}" for us, name in imports]
+    lines += ["", "app.py / src functions by cumulative time (s, calls):"]
+    lines += [f"  {ct:>8.3f}  {nc:>6}  {where}" for ct, nc, where in funcs]
+    report = "\n".join(lines)
+    print(report)
+    if args.out:
+        Path(args.out).write_text(report + "\n", encoding="utf-8")
+        print(f"\n[OK] Wrote {args.out}")
+
+if __name__ == "__main__":
+    main()